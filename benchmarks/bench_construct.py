@@ -0,0 +1,46 @@
+"""
+Bulk construction of cards with the same free squares, passing them as a
+tuple, which looks up the cached layout, and as a shared `FreeLayout`.
+
+    python benchmarks/bench_construct.py [cards]
+"""
+
+import gc
+import random
+import sys
+import time
+
+from binguistics.card import Card, CardBase, free_layout
+
+
+def best(f, repeat: int = 5) -> float:
+    r = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        f()
+        r.append(time.perf_counter() - t)
+    return min(r)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = random.Random(0)
+    labels = [rng.sample(range(1, 76), 24) for _ in range(n)]
+    free = (12,)
+    layout = free_layout(5, free)
+
+    cases = {
+        "CardBase, tuple": lambda: [CardBase(5, 0, free) for _ in labels],
+        "CardBase, layout": lambda: [CardBase(5, 0, layout) for _ in labels],
+        "Card, tuple": lambda: [Card(5, x, free=free) for x in labels],
+        "Card, layout": lambda: [Card(5, x, free=layout) for x in labels],
+    }
+
+    gc.disable()
+    print(f"{n} cards of size 5")
+    for name, f in cases.items():
+        print(f"  {name:<18} {best(f):8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Rendering throughput: the old `show` loop against `render` and `CardView`,
+and bulk exports of labeled cards.
+
+    python benchmarks/bench_render.py
+"""
+
+import random
+import timeit
+
+from binguistics.card import Card
+from binguistics.render import CardView, export_html, export_svg, export_text, render
+
+N = 1000
+
+
+def show_loop(card, blank="0", filled="1", free="F"):
+    # CardBase.show before rendering was split out, without the print
+    s = ""
+    m = card.size
+    for row in range(m):
+        for col in range(m):
+            square = col * m + row
+            if square in card.free:
+                s += free
+                continue
+            if card.state & (1 << square):
+                s += filled
+            else:
+                s += blank
+        s += "\n"
+    return s
+
+
+def make_cards(size: int) -> list[Card]:
+    rng = random.Random(size)
+    cards = []
+    for _ in range(N):
+        c = Card(size, rng.sample(range(1, 100), size**2 - 1), free=(size**2 // 2,))
+        for label in rng.sample(range(1, 100), 30):
+            c.fill_by_label(label)
+        cards.append(c)
+    return cards
+
+
+def rate(stmt, number: int = 5) -> float:
+    return N * number / min(timeit.repeat(stmt, number=number, repeat=3))
+
+
+def main():
+    for size in (5, 9):
+        cards = make_cards(size)
+        views = [CardView(c) for c in cards]
+
+        def incremental():
+            for v in views:
+                v.card.fill(0)
+                v.update()
+                v.text
+
+        print(f"size {size}")
+        for name, stmt in (
+            ("show loop", lambda: [show_loop(c) for c in cards]),
+            ("render", lambda: [render(c) for c in cards]),
+            ("CardView", incremental),
+            ("export_text", lambda: export_text(cards)),
+            ("export_html", lambda: export_html(cards)),
+            ("export_svg", lambda: export_svg(cards)),
+        ):
+            print(f"  {name:<12}{rate(stmt):12.0f} cards/s")
+
+
+if __name__ == "__main__":
+    main()
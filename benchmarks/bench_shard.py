@@ -0,0 +1,47 @@
+"""
+Scaling of `ShardedHall` over 1 to N worker processes, against filling and
+checking the same cards in a single process.
+
+    python benchmarks/bench_shard.py [cards] [max processes]
+"""
+
+import os
+import random
+import sys
+import time
+
+from binguistics.card import Card
+from binguistics.shard import ShardedHall
+
+
+def make_cards(n: int) -> list[Card]:
+    rng = random.Random(0)
+    return [Card(5, rng.sample(range(1, 76), 24), free=(12,)) for _ in range(n)]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    max_procs = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    calls = random.Random(1).sample(range(1, 76), 75)
+
+    cards = make_cards(n)
+    t = time.perf_counter()
+    for label in calls:
+        for c in cards:
+            c.fill_by_label(label)
+            c.is_bingo()
+    base = time.perf_counter() - t
+    print(f"{n} cards, 75 calls")
+    print(f"  single process  {base:8.3f} s")
+
+    for procs in range(1, max_procs + 1):
+        with ShardedHall(make_cards(n), processes=procs) as hall:
+            t = time.perf_counter()
+            for label in calls:
+                hall.draw(label)
+            elapsed = time.perf_counter() - t
+        print(f"  {procs:2d} processes    {elapsed:8.3f} s  x{base / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Import time of `binguistics.card` and the cost of the first call per size.
+
+Each measurement runs in a fresh interpreter so that nothing is cached.
+
+    python benchmarks/bench_startup.py
+"""
+
+import statistics
+import subprocess
+import sys
+
+REPEAT = 20
+
+SNIPPETS = {
+    "import": "",
+    "first is_bingo (size 5)": "card.CardBase(5, 0b11111).is_bingo()",
+    "first is_bingo (size 12)": "card.CardBase(12, 0b11111).is_bingo()",
+    "first line_mask (size 5)": "card.line_mask(5)",
+}
+
+TEMPLATE = """
+import time
+t = time.perf_counter()
+import binguistics.card as card
+t_import = time.perf_counter() - t
+t = time.perf_counter()
+{snippet}
+t_call = time.perf_counter() - t
+print(t_import if not {snippet!r} else t_call)
+"""
+
+
+def measure(snippet: str) -> float:
+    code = TEMPLATE.format(snippet=snippet)
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return float(out.stdout)
+
+
+def main():
+    for name, snippet in SNIPPETS.items():
+        samples = [measure(snippet) for _ in range(REPEAT)]
+        print(f"{name:<28} {statistics.median(samples) * 1e6:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+NumPy interop for analyzing many card states at once.
+
+States are exported either as a packed bit-matrix or as a boolean grid.
+In a packed bit-matrix of shape `(N, (size**2 + 7) // 8)` and dtype `uint8`,
+row `i` holds the state of the `i`-th card in little-endian order: bit `b`
+of byte `j` corresponds to the square with the ID of `8*j + b`.
+A boolean grid of shape `(N, size, size)` is indexed as `grid[i, row, col]`,
+so that `grid[i]` looks like the card printed by `CardBase.show`; the square
+with the ID of `col*size + row` is at `[row, col]`.
+
+`completion_times` and the functions after it analyze, over many call orders
+at once, when each line of a card is completed.
+
+This module requires NumPy, which can be installed with the `numpy` extra.
+"""
+
+import collections.abc
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "binguistics.array requires NumPy; install binguistics[numpy]"
+    ) from e
+
+from .card import GridCard, GridCardBase, line_mask_values
+
+
+def pack_states(states: collections.abc.Iterable[int], size: int) -> np.ndarray:
+    """
+    Pack card states into a bit-matrix.
+
+    Parameters
+    ----------
+    states : Iterable[int]
+        States of cards with `size`
+    size : int
+        Cards' size
+
+    Returns
+    -------
+    numpy.ndarray
+        A `uint8` array of shape `(N, (size**2 + 7) // 8)`.
+    """
+    if size < 2:
+        raise ValueError("size must be greater than or equal to 2")
+    return _pack(states, size**2)
+
+
+def _pack(states: collections.abc.Iterable[int], n: int) -> np.ndarray:
+    # Same as `pack_states`, for cards with `n` squares
+    nbytes = (n + 7) // 8
+
+    def to_bytes(state: int) -> bytes:
+        if state < 0 or state.bit_length() > n:
+            raise ValueError("state must be less than or equal to size**2 bits")
+        return state.to_bytes(nbytes, "little")
+
+    buf = b"".join(map(to_bytes, states))
+    return np.frombuffer(buf, dtype=np.uint8).reshape(-1, nbytes).copy()
+
+
+def pack_cards(cards: collections.abc.Iterable[GridCardBase]) -> np.ndarray:
+    """
+    Pack the states of cards into a bit-matrix.
+
+    Parameters
+    ----------
+    cards : Iterable[GridCardBase]
+        Cards with the same number of squares, such as `CardBase`s of
+        the same size; there must be at least one card.
+
+    Returns
+    -------
+    numpy.ndarray
+        A `uint8` array of shape `(N, (height*width + 7) // 8)`.
+    """
+    cards = tuple(cards)
+    if not cards:
+        raise ValueError("no cards")
+    n = cards[0]._lines.n
+    if any(c._lines.n != n for c in cards):
+        raise ValueError("cards must have the same number of squares")
+    return _pack((c.state for c in cards), n)
+
+
+def unpack_states(packed: np.ndarray) -> tuple[int, ...]:
+    """
+    Convert a bit-matrix back to card states.
+
+    Parameters
+    ----------
+    packed : numpy.ndarray
+        A bit-matrix returned by `pack_states`
+
+    Returns
+    -------
+    tuple[int]
+        States of the cards.
+    """
+    packed = np.ascontiguousarray(packed, dtype=np.uint8)
+    return tuple(int.from_bytes(row.tobytes(), "little") for row in packed)
+
+
+def to_grid(packed: np.ndarray, size: int) -> np.ndarray:
+    """
+    Convert a bit-matrix to a boolean grid.
+
+    Parameters
+    ----------
+    packed : numpy.ndarray
+        A bit-matrix returned by `pack_states`
+    size : int
+        Cards' size
+
+    Returns
+    -------
+    numpy.ndarray
+        A `bool` array of shape `(N, size, size)`.
+    """
+    bits = np.unpackbits(
+        np.asarray(packed, dtype=np.uint8), axis=1, count=size**2, bitorder="little"
+    )
+    return bits.reshape(-1, size, size).transpose(0, 2, 1).astype(bool)
+
+
+def _to_squares(grid: np.ndarray) -> np.ndarray:
+    # (N, size, size) indexed by [row, col] -> (N, size**2) indexed by square ID
+    n, size, _ = grid.shape
+    return grid.transpose(0, 2, 1).reshape(n, size * size)
+
+
+def _line_matrix(size: int) -> np.ndarray:
+    # (lines, size**2); the lines are in the order of `line_mask(size)`
+    masks = line_mask_values(size)
+    return np.array(
+        [[(mask >> i) & 1 for i in range(size**2)] for mask in masks],
+        dtype=np.int32,
+    )
+
+
+def square_frequency(grid: np.ndarray) -> np.ndarray:
+    """
+    Count how many cards have each square filled, including free squares.
+
+    Parameters
+    ----------
+    grid : numpy.ndarray
+        A boolean grid of shape `(N, size, size)`
+
+    Returns
+    -------
+    numpy.ndarray
+        An integer array of shape `(size, size)`, indexed by `[row, col]`.
+    """
+    return np.count_nonzero(grid, axis=0)
+
+
+def line_counts(grid: np.ndarray) -> np.ndarray:
+    """
+    Count filled squares in each line on each card.
+
+    Parameters
+    ----------
+    grid : numpy.ndarray
+        A boolean grid of shape `(N, size, size)`
+
+    Returns
+    -------
+    numpy.ndarray
+        An integer array of shape `(N, 2*size + 2)`; the columns are in
+        the order of `line_mask(size)`.
+    """
+    size = grid.shape[1]
+    return _to_squares(grid).astype(np.int32) @ _line_matrix(size).T
+
+
+def line_completion_counts(grid: np.ndarray) -> np.ndarray:
+    """
+    Count how many cards have each line fully filled.
+
+    Parameters
+    ----------
+    grid : numpy.ndarray
+        A boolean grid of shape `(N, size, size)`
+
+    Returns
+    -------
+    numpy.ndarray
+        An integer array of shape `(2*size + 2,)` in the order of `line_mask(size)`.
+    """
+    size = grid.shape[1]
+    return np.count_nonzero(line_counts(grid) == size, axis=0)
+
+
+def ready_counts(grid: np.ndarray) -> np.ndarray:
+    """
+    Count lines missing only one square on each card.
+    A card is ready, as in `CardBase.is_ready`, if and only if its count is
+    positive.
+
+    Parameters
+    ----------
+    grid : numpy.ndarray
+        A boolean grid of shape `(N, size, size)`
+
+    Returns
+    -------
+    numpy.ndarray
+        An integer array of shape `(N,)`.
+    """
+    size = grid.shape[1]
+    return np.count_nonzero(line_counts(grid) == size - 1, axis=1)
+
+
+def random_calls(
+    labels: collections.abc.Sequence[int], k: int, seed: int | None = None
+) -> np.ndarray:
+    """
+    Generate random call orders.
+
+    Parameters
+    ----------
+    labels : Sequence[int]
+        Integer labels to call
+    k : int
+        Number of call orders
+    seed : int, optional
+        Seed of the random number generator, by default None
+
+    Returns
+    -------
+    numpy.ndarray
+        An integer array of shape `(k, len(labels))`; each row is a permutation
+        of `labels`.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.permuted(np.tile(np.asarray(labels, dtype=np.int64), (k, 1)), axis=1)
+
+
+def _square_label_ids(card: GridCard) -> np.ndarray:
+    # Integer label of each square, or -1 for free squares
+    if card.vocabulary is not None:
+        return np.asarray(card._label_ids, dtype=np.int64)
+    r = np.full(card._lines.n, -1, dtype=np.int64)
+
+    for square, label in card._table().items():
+        if not isinstance(label, int) or label < 0:
+            raise ValueError("labels must be non-negative integers")
+        r[square] = label
+    return r
+
+
+def completion_times(card: GridCard, calls: np.ndarray) -> np.ndarray:
+    """
+    Calculate when each line of a card is completed in each call order.
+
+    Parameters
+    ----------
+    card : GridCard
+        A card, such as `Card` or `VariantCard`, whose labels are non-negative
+        integers, or a card with a vocabulary, in which case `calls` are
+        label IDs of the vocabulary.
+    calls : numpy.ndarray
+        An integer array of shape `(K, C)`; each row is a call order.
+
+    Returns
+    -------
+    numpy.ndarray
+        An integer array of shape `(K, L)`, where `L` is the number of
+        winning lines, in the order of `card.line_masks`. Each element is
+        the number of calls after which the line is completed: 0 if it
+        already is, and `C + 1` if it is not completed by the calls.
+    """
+    calls = np.asarray(calls, dtype=np.int64)
+    if calls.ndim != 2:
+        raise ValueError("calls must be a 2-dimensional array")
+    if calls.size and calls.min() < 0:
+        raise ValueError("labels must be non-negative integers")
+    n_orders, n_calls = calls.shape
+    n = card._lines.n
+    ids = _square_label_ids(card)
+    n_labels = max(int(calls.max(initial=-1)), int(ids.max())) + 1
+
+    # call_time[k, label]: when the label is called in the k-th order
+    call_time = np.full((n_orders, n_labels), n_calls + 1, dtype=np.int64)
+    call_time[np.arange(n_orders)[:, None], calls[:, ::-1]] = np.arange(n_calls, 0, -1)
+
+    square_time = call_time[:, np.maximum(ids, 0)]
+    state = np.array([card.state >> i & 1 for i in range(n)], dtype=bool)
+    square_time[:, state] = 0
+
+    # Lines may have different lengths, so pad them with their first square.
+    lines = [[i for i in range(n) if mask >> i & 1] for mask in card.line_masks]
+    width = max(map(len, lines))
+    squares = np.array([line + line[:1] * (width - len(line)) for line in lines])
+    return square_time[:, squares].max(axis=2)
+
+
+def bingo_times(times: np.ndarray) -> np.ndarray:
+    """
+    Calculate when a card reaches bingo in each call order.
+
+    Parameters
+    ----------
+    times : numpy.ndarray
+        Completion times returned by `completion_times`
+
+    Returns
+    -------
+    numpy.ndarray
+        An integer array of shape `(K,)`.
+    """
+    return times.min(axis=1)
+
+
+def first_line_counts(times: np.ndarray) -> np.ndarray:
+    """
+    Count how many times each line is the first to be completed.
+    Lines completed at the same call all count.
+
+    Parameters
+    ----------
+    times : numpy.ndarray
+        Completion times returned by `completion_times`
+
+    Returns
+    -------
+    numpy.ndarray
+        An integer array of shape `(L,)` in the order of the lines in `times`.
+    """
+    return np.count_nonzero(times == bingo_times(times)[:, None], axis=0)
+
+
+def completion_cdf(times: np.ndarray, n_calls: int) -> np.ndarray:
+    """
+    Calculate the fraction of call orders in which each line is completed
+    within each number of calls.
+
+    Parameters
+    ----------
+    times : numpy.ndarray
+        Completion times returned by `completion_times`
+    n_calls : int
+        Number of calls in a call order; it must not be less than the number
+        of calls `times` was calculated with.
+
+    Returns
+    -------
+    numpy.ndarray
+        A float array of shape `(L, n_calls + 1)`; `[j, t]` is
+        the fraction for the `j`-th line and `t` calls.
+    """
+    if n_calls < 0:
+        raise ValueError("negative value")
+    if times.size and times.max() > n_calls + 1:
+        raise ValueError("times has more calls than n_calls")
+    counts = np.zeros((times.shape[1], n_calls + 2), dtype=np.int64)
+    for j in range(times.shape[1]):
+        counts[j] = np.bincount(times[:, j], minlength=n_calls + 2)
+    return np.cumsum(counts[:, : n_calls + 1], axis=1) / times.shape[0]
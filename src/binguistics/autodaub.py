@@ -0,0 +1,236 @@
+import asyncio
+import collections.abc
+import typing
+
+from .card import GridCard, _label_index
+
+
+class DaubBatch(typing.NamedTuple):
+    """
+    The result of applying coalesced draws.
+    """
+
+    labels: tuple[object, ...]
+    """The drawn labels, in order"""
+    winners: tuple[int, ...]
+    """Indices of the cards that have newly reached bingo"""
+    ready: tuple[int, ...]
+    """Indices of the updated cards that are ready"""
+
+
+class DaubMetrics(typing.NamedTuple):
+    """
+    Statistics of an `AutoDauber`.
+    """
+
+    draws: int
+    """Number of draws applied"""
+    batches: int
+    """Number of batches the draws were coalesced into"""
+    fills: int
+    """Number of times a card had to be filled with one label"""
+    updates: int
+    """Number of times a card was actually updated and evaluated"""
+    mean_latency: float
+    """Mean time from a draw to its application, in seconds"""
+    max_latency: float
+    """Maximum time from a draw to its application, in seconds"""
+
+    @property
+    def draws_per_batch(self) -> float:
+        """Average number of draws coalesced into a batch"""
+        return self.draws / self.batches if self.batches else 0.0
+
+    @property
+    def saved(self) -> float:
+        """Fraction of fills saved by coalescing"""
+        return 1 - self.updates / self.fills if self.fills else 0.0
+
+
+class AutoDauber:
+    """
+    This class fills cards automatically with draws, coalescing draws that
+    arrive close together.
+
+    The first draw of a batch starts a window of `window` seconds. Draws that
+    arrive within the window are combined, and when it closes, or when
+    `max_batch` draws have arrived, each affected card is filled with all of
+    them by a single OR of its state and then evaluated once.
+    It must be used from a running event loop. Labels must be hashable.
+    """
+
+    def __init__(
+        self,
+        cards: collections.abc.Iterable[GridCard],
+        window: float = 0.05,
+        max_batch: int | None = None,
+        k: int = 1,
+    ):
+        """
+        Parameters
+        ----------
+        cards : Iterable[GridCard]
+            Cards to fill, such as `Card` or `VariantCard`
+        window : float, optional
+            Maximum time in seconds a draw waits for others, by default 0.05;
+            this bounds the latency of a draw.
+        max_batch : int, optional
+            Maximum number of draws in a batch, by default None, which means
+            no limit
+        k : int, optional
+            Number of fully filled lines for bingo, by default 1
+        """
+        if window < 0 or k < 0:
+            raise ValueError("negative value")
+        if max_batch is not None and max_batch < 1:
+            raise ValueError("max_batch must be positive")
+
+        self._cards = list(cards)
+        self._window = window
+        self._max_batch = max_batch
+        self._k = k
+
+        self._index = _label_index(c.label_masks() for c in self._cards)
+
+        self._won = {i for i, c in enumerate(self._cards) if c.is_bingo(k)}
+        self._pending: list[tuple[object, float, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+
+        self._draws = 0
+        self._batches = 0
+        self._fills = 0
+        self._updates = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    @property
+    def cards(self) -> tuple[GridCard, ...]:
+        """
+        The cards being filled.
+
+        Returns
+        -------
+        tuple[GridCard]
+            The cards, in the order they were given.
+        """
+        return tuple(self._cards)
+
+    @property
+    def metrics(self) -> DaubMetrics:
+        """
+        Statistics of coalescing so far.
+
+        Returns
+        -------
+        DaubMetrics
+            Statistics of coalescing so far.
+        """
+        return DaubMetrics(
+            self._draws,
+            self._batches,
+            self._fills,
+            self._updates,
+            self._total_latency / self._draws if self._draws else 0.0,
+            self._max_latency,
+        )
+
+    def draw(self, label: object) -> asyncio.Future:
+        """
+        Queue a drawn label.
+
+        Parameters
+        ----------
+        label : object
+            The drawn label.
+
+        Returns
+        -------
+        asyncio.Future
+            A future whose result is the `DaubBatch` the label is applied in.
+
+        Raises
+        ------
+        TypeError
+            If `label` is not hashable.
+        """
+        hash(label)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((label, loop.time(), future))
+
+        if self._max_batch is not None and len(self._pending) >= self._max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self.flush)
+        return future
+
+    def flush(self) -> DaubBatch | None:
+        """
+        Apply the queued draws now.
+
+        Returns
+        -------
+        DaubBatch or None
+            The result, or `None` if no draw was queued.
+
+        If applying the draws fails, the futures of all of them are given the
+        exception, which is also raised.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return None
+        pending, self._pending = self._pending, []
+
+        try:
+            # card index -> squares to fill
+            masks: dict[int, int] = dict()
+
+            for label, _, _ in pending:
+                for i, mask in self._index.get(label, ()):
+                    masks[i] = masks.get(i, 0) | mask
+                    self._fills += 1
+
+            winners = []
+            ready = []
+
+            for i, mask in sorted(masks.items()):
+                c = self._cards[i]
+                if c._state & mask == mask:
+                    continue
+                c._state |= mask
+                self._updates += 1
+                if i not in self._won and c.is_bingo(self._k):
+                    self._won.add(i)
+                    winners.append(i)
+                if c.is_ready():
+                    ready.append(i)
+
+            batch = DaubBatch(
+                tuple(x[0] for x in pending), tuple(winners), tuple(ready)
+            )
+        except Exception as e:
+            # Do not leave the draws of the batch waiting forever.
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+
+        now = asyncio.get_running_loop().time()
+
+        for _, arrival, future in pending:
+            latency = now - arrival
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+            if not future.done():
+                future.set_result(batch)
+        self._draws += len(pending)
+        self._batches += 1
+        return batch
+
+    async def close(self):
+        """
+        Apply the queued draws, if any, and stop waiting for more.
+        """
+        self.flush()
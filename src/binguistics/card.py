@@ -1,5 +1,51 @@
-import collections.abc
-import enum
+from __future__ import annotations
+
+# Importing `threading` is a noticeable part of the startup cost, so locks
+# come from the built-in module it is based on.
+from _thread import allocate_lock
+
+# So is importing `collections.abc` and `enum`, so they are only imported for
+# type checking and on first use of named line masks.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    import collections.abc
+    import enum
+
+
+def _line_mask_members(size: int) -> tuple[tuple[str, int], ...]:
+    if size < 2:
+        raise ValueError("size must be greater than or equal to 2")
+    row_0 = 2**size - 1
+    col_0 = sum(1 << i for i in range(0, size**2, size))
+
+    return tuple(
+        [(f"COLUMN_{i}", row_0 << (size * i)) for i in range(size)]
+        + [
+            (
+                f"ROW_{i}",
+                col_0 << i,
+            )
+            for i in range(size)
+        ]
+        + [
+            (
+                "DIAGONAL_1",
+                sum(1 << i for i in range(0, size**2, size + 1)),
+            ),
+            (
+                "DIAGONAL_2",
+                sum(
+                    1 << i
+                    for i in range(
+                        size - 1,
+                        size**2 - size + 1,
+                        size - 1,
+                    )
+                ),
+            ),
+        ]
+    )
 
 
 class _LineMaskFactory:
@@ -7,42 +53,20 @@ class _LineMaskFactory:
 
     _instances: dict[int, enum.EnumMeta] = dict()
 
+    # Plain `(name, value)` pairs of the members, precomputed for common sizes.
+    _members: dict[int, tuple[tuple[str, int], ...]] = {
+        size: _line_mask_members(size) for size in range(3, 10)
+    }
+    _values: dict[int, tuple[int, ...]] = {
+        size: tuple(v for _, v in members) for size, members in _members.items()
+    }
+
     @classmethod
     def create(cls, size: int) -> enum.EnumMeta:
-        if size < 2:
-            raise ValueError("size must be greater than or equal to 2")
-        row_0 = 2**size - 1
-        col_0 = sum(1 << i for i in range(0, size**2, size))
+        import enum
 
         LineMask_m = enum.IntEnum(  # type: ignore
-            f"LineMask_{size}",
-            dict(
-                [(f"COLUMN_{i}", row_0 << (size * i)) for i in range(size)]
-                + [
-                    (
-                        f"ROW_{i}",
-                        col_0 << i,
-                    )
-                    for i in range(size)
-                ]
-                + [
-                    (
-                        "DIAGONAL_1",
-                        sum(1 << i for i in range(0, size**2, size + 1)),
-                    ),
-                    (
-                        "DIAGONAL_2",
-                        sum(
-                            1 << i
-                            for i in range(
-                                size - 1,
-                                size**2 - size + 1,
-                                size - 1,
-                            )
-                        ),
-                    ),
-                ]
-            ),
+            f"LineMask_{size}", cls.members(size)
         )
 
         return LineMask_m
@@ -53,6 +77,18 @@ class _LineMaskFactory:
             cls._instances[size] = cls.create(size)
         return cls._instances[size]
 
+    @classmethod
+    def members(cls, size: int) -> tuple[tuple[str, int], ...]:
+        if size not in cls._members:
+            cls._members[size] = _line_mask_members(size)
+        return cls._members[size]
+
+    @classmethod
+    def values(cls, size: int) -> tuple[int, ...]:
+        if size not in cls._values:
+            cls._values[size] = tuple(v for _, v in cls.members(size))
+        return cls._values[size]
+
 
 def line_mask(size: int) -> enum.EnumMeta:
     """
@@ -77,6 +113,25 @@ def line_mask(size: int) -> enum.EnumMeta:
     return _LineMaskFactory.get(size)
 
 
+def line_mask_values(size: int) -> tuple[int, ...]:
+    """
+    Return the values of `line_mask(size)` as plain integers, in the same order.
+    Unlike `line_mask`, this does not create an `IntEnum`, which makes it
+    much cheaper on the first call for each size.
+
+    Parameters
+    ----------
+    size : int
+        Card's size
+
+    Returns
+    -------
+    tuple[int]
+        Masks of all rows, columns and diagonals on a card with `size`.
+    """
+    return _LineMaskFactory.values(size)
+
+
 def _find_ones(nonneg_n: int) -> tuple[int, ...]:
     if nonneg_n < 0:
         raise ValueError("negative value")
@@ -91,70 +146,471 @@ def _find_ones(nonneg_n: int) -> tuple[int, ...]:
     return tuple(r)
 
 
-class CardBase:
-    """
-    This is the base class that represents a bingo card.
+class _LineTable:
+    # The shape of cards and the masks of their winning lines as plain
+    # integers. Instances are shared through `_LineTableFactory`, so they are
+    # compared and hashed by identity, which keeps cache lookups cheap.
 
-    A card has four important attributes:
-    * size
-    * state
-    * square IDs
-    * free squares
+    def __init__(self, height: int, width: int, masks: tuple[int, ...]):
+        self.height = height
+        self.width = width
+        self.n = height * width
+        self.masks = masks
 
-    If a card has a size of `n`, that means the card has `n*n` squares.
-    The state of a card shows which squares are filled and which are not.
-    It is an `n*n`-bit integer and its set bits correspond to filled squares.
-    The `k`-th bit of a state integer means the square with the ID of `k`.
-    For example, on a bingo card of size 5, the IDs are arranged as follows.
+    def __reduce__(self):
+        # Unpickle to the shared instance.
+        return (_LineTableFactory.get, (self.height, self.width, self.masks))
 
-        0 5 10 15 20
-        1 6 11 16 21
-        2 7 12 17 22
-        3 8 13 18 23
-        4 9 14 19 24
+    def missing(self, state: int) -> tuple[int, ...]:
+        # Number of unfilled squares in each line
+        return _active_cache._missing(self, state)
+
+
+class _LineTableFactory:
+    # Each instance is a singleton.
+
+    _instances: dict[tuple[int, int, tuple[int, ...]], _LineTable] = dict()
+    _squares: dict[int, _LineTable] = dict()
+
+    @classmethod
+    def get(cls, height: int, width: int, masks: tuple[int, ...]) -> _LineTable:
+        key = (height, width, masks)
+        if key not in cls._instances:
+            cls._instances.setdefault(key, _LineTable(height, width, masks))
+        return cls._instances[key]
+
+    @classmethod
+    def square(cls, size: int) -> _LineTable:
+        if size not in cls._squares:
+            cls._squares[size] = cls.get(size, size, line_mask_values(size))
+        return cls._squares[size]
+
+
+class LineAnalysisCache:
+    """
+    This class is a bounded LRU cache of line analyses.
+
+    A line analysis is the number of squares still to be filled in each
+    winning line of a card, which depends only on the lines and the state of
+    the card. Cards look up `line_analysis_cache` in `is_bingo`, `is_ready`,
+    `last_pieces_for_bingo`, `CardBase.analyze_lines` and
+    `VariantCardBase.analyze_missing`, so that cards with identical states
+    share the work. It can be used from several threads at once.
     """
 
-    def __init__(
-        self, size: int, state: int = 0, free: collections.abc.Iterable[int] = ()
-    ):
+    def __init__(self, maxsize: int = 4096):
+        """
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum number of analyses to keep, by default 4096;
+            0 disables caching.
+        """
+        if maxsize < 0:
+            raise ValueError("negative value")
+        self._maxsize = maxsize
+        self._data: dict[tuple[_LineTable, int], tuple[int, ...]] = dict()
+        self._lock = allocate_lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Maximum number of analyses to keep.
+
+        Returns
+        -------
+        int
+            Maximum number of analyses to keep.
+        """
+        return self._maxsize
+
+    @property
+    def currsize(self) -> int:
+        """
+        Number of analyses currently kept.
+
+        Returns
+        -------
+        int
+            Number of analyses currently kept.
+        """
+        return len(self._data)
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of lookups answered from the cache.
+
+        Returns
+        -------
+        int
+            Number of lookups answered from the cache.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Number of lookups that needed a new analysis.
+
+        Returns
+        -------
+        int
+            Number of lookups that needed a new analysis.
+        """
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        Number of analyses discarded to make room for new ones.
+
+        Returns
+        -------
+        int
+            Number of analyses discarded to make room for new ones.
+        """
+        return self._evictions
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Ratio of hits to all lookups.
+
+        Returns
+        -------
+        float
+            Ratio of hits to all lookups, or 0.0 if there has been no lookup.
+        """
+        total = self._hits + self._misses
+        return self._hits / total if total else 0.0
+
+    def resize(self, maxsize: int):
+        """
+        Change the maximum number of analyses to keep, discarding the least
+        recently used ones if necessary.
+
+        Parameters
+        ----------
+        maxsize : int
+            Maximum number of analyses to keep; 0 disables caching.
+        """
+        if maxsize < 0:
+            raise ValueError("negative value")
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._data) > maxsize:
+                del self._data[next(iter(self._data))]
+                self._evictions += 1
+
+    def clear(self):
+        """
+        Discard all analyses and reset the statistics.
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def get(self, size: int, state: int) -> tuple[int, ...]:
         """
+        Return the line analysis of a card of `CardBase`.
+
         Parameters
         ----------
         size : int
             Card's size
-        state : int, optional
-            Initial state, by default 0
+        state : int
+            Card's state
+
+        Returns
+        -------
+        tuple[int]
+            Number of filled squares in each line, in the order of
+            `line_mask(size)`.
+        """
+        missing = self._missing(_LineTableFactory.square(size), state)
+        return tuple(size - m for m in missing)
+
+    def _missing(self, lines: _LineTable, state: int) -> tuple[int, ...]:
+        # The line analysis of a card with `lines`
+        key = (lines, state)
+        data = self._data
+
+        # A dict keeps insertion order, so re-inserting an entry on every
+        # lookup leaves the least recently used one first.
+        with self._lock:
+            r = data.pop(key, None)
+            if r is not None:
+                self._hits += 1
+                data[key] = r
+                return r
+            self._misses += 1
+
+        # Analyze outside the lock; another thread may add the same entry
+        # meanwhile, in which case it is kept.
+        r = tuple((~state & mask).bit_count() for mask in lines.masks)
+
+        with self._lock:
+            if self._maxsize and key not in data:
+                if len(data) >= self._maxsize:
+                    del data[next(iter(data))]
+                    self._evictions += 1
+                data[key] = r
+        return r
+
+
+line_analysis_cache = LineAnalysisCache()
+"""The line analysis cache shared by all cards."""
+
+# The cache cards actually look up; it is only replaced by `_use_cache`.
+_active_cache = line_analysis_cache
+
+
+def _use_cache(cache: LineAnalysisCache) -> LineAnalysisCache:
+    # Make cards look up `cache` instead of the current one, which is returned,
+    # without touching the entries and statistics of `line_analysis_cache`.
+    global _active_cache
+    previous = _active_cache
+    _active_cache = cache
+    return previous
+
+
+class FreeLayout:
+    """
+    This class represents validated free squares of cards with `n` squares.
+
+    Use `free_layout` to get an instance for cards with a size, which is
+    cached, or the `layout` of an existing card. Passing it as `free` to the
+    constructor of a card skips validating and sorting the free squares,
+    so building many cards with the same free squares is cheaper.
+    """
+
+    def __init__(self, n: int, free: collections.abc.Iterable[int] = ()):
+        """
+        Parameters
+        ----------
+        n : int
+            Number of squares on cards
         free : Iterable[int], optional
             IDs of free squares, by default ()
         """
-        if size < 2:
-            raise ValueError("size must be greater than or equal to 2")
-        self._size = size
+        if n < 1:
+            raise ValueError("n must be positive")
+        mask = 0
+
+        for i in free:
+            if not (0 <= i < n):
+                raise ValueError("out of range")
+            mask |= 1 << i
+
+        self._n = n
+        self._mask = mask
+        self._free = _find_ones(mask)
+        self._squares = _find_ones(~mask & ((1 << n) - 1))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FreeLayout):
+            return NotImplemented
+        return (self._n, self._mask) == (other._n, other._mask)
+
+    def __hash__(self) -> int:
+        return hash((self._n, self._mask))
+
+    def __repr__(self) -> str:
+        return f"FreeLayout({self._n}, {self._free})"
+
+    @property
+    def n(self) -> int:
+        """
+        Number of squares on cards.
+
+        Returns
+        -------
+        int
+            Number of squares on cards.
+        """
+        return self._n
+
+    @property
+    def mask(self) -> int:
+        """
+        Free squares as a state.
+
+        Returns
+        -------
+        int
+            An integer whose set bits correspond to the free squares.
+        """
+        return self._mask
+
+    @property
+    def free(self) -> tuple[int, ...]:
+        """
+        Free squares.
+
+        Returns
+        -------
+        tuple[int]
+            IDs of the free squares, in increasing order.
+        """
+        return self._free
+
+    @property
+    def squares(self) -> tuple[int, ...]:
+        """
+        Non-free squares, which are the squares with labels on a `Card`.
+
+        Returns
+        -------
+        tuple[int]
+            IDs of the non-free squares, in increasing order.
+        """
+        return self._squares
 
-        if state < 0 or state.bit_length() > size**2:
-            raise ValueError("state must be less than or equal to size**2 bits")
-        self._state = state
 
-        tmp_free = set()
+class _FreeLayoutFactory:
+    # Instances are cached by number of squares and mask of free squares, so
+    # the order and duplicates of the given free squares do not matter. Only
+    # the `maxsize` most recently used ones are kept.
+
+    maxsize = 256
+    _instances: dict[tuple[int, int], FreeLayout] = dict()
+    _lock = allocate_lock()
+
+    @classmethod
+    def get(cls, n: int, free: collections.abc.Iterable[int]) -> FreeLayout:
+        mask = 0
 
         for i in free:
-            if not (0 <= i < size**2):
+            if not (0 <= i < n):
                 raise ValueError("out of range")
-            tmp_free.add(i)
-            self._state |= 1 << i
-        self._free = tuple(sorted(tmp_free))
+            mask |= 1 << i
+        key = (n, mask)
+
+        with cls._lock:
+            r = cls._instances.pop(key, None)
+            if r is None:
+                r = FreeLayout(n, _find_ones(mask))
+                if len(cls._instances) >= cls.maxsize:
+                    del cls._instances[next(iter(cls._instances))]
+            cls._instances[key] = r
+        return r
+
+
+def free_layout(size: int, free: collections.abc.Iterable[int] = ()) -> FreeLayout:
+    """
+    Return the cached `FreeLayout` of free squares on cards with `size`.
+    The same free squares give the same instance regardless of their order
+    and duplicates, as long as it is among the 256 most recently used ones.
+
+    Parameters
+    ----------
+    size : int
+        Cards' size
+    free : Iterable[int], optional
+        IDs of free squares, by default ()
+
+    Returns
+    -------
+    FreeLayout
+        The layout, for `size**2` squares.
+    """
+    if size < 2:
+        raise ValueError("size must be greater than or equal to 2")
+    return _FreeLayoutFactory.get(size**2, free)
+
+
+class GridCardBase:
+    """
+    This is the base class of cards whose squares are arranged in rows and
+    columns, such as `CardBase` and `VariantCardBase`.
+
+    A card has `height` rows and `width` columns. Square IDs are arranged
+    column by column: the square with the ID of `k` is in column `k // height`
+    and row `k % height`, and bit `k` of the state tells whether it is filled.
+    Winning lines are given as masks of square IDs, which may have different
+    lengths. This class implements everything that does not depend on the
+    shape of the lines.
+
+    Cards are equal if they have the same class, lines, state and free squares,
+    and cards that are equal have the same hash. Note that filling a square
+    changes the hash of a card.
+    """
+
+    def _setup(
+        self,
+        lines: _LineTable,
+        state: int,
+        free: collections.abc.Iterable[int] | FreeLayout,
+    ):
+        # Called by the constructors of subclasses
+        n = lines.n
+
+        if state < 0 or state.bit_length() > n:
+            raise ValueError("state must be less than or equal to height*width bits")
+
+        if not isinstance(free, FreeLayout):
+            free = _FreeLayoutFactory.get(n, free)
+        elif free._n != n:
+            raise ValueError("the layout is for another number of squares")
+        self._lines = lines
+        self._layout = free
+        self._state = state | free._mask
+        self._free = free._free
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GridCardBase) or type(other) is not type(self):
+            return NotImplemented
+        return (self._lines, self._state, self._layout._mask) == (
+            other._lines,
+            other._state,
+            other._layout._mask,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self._lines, self._state, self._layout._mask))
 
     @property
-    def size(self) -> int:
+    def height(self) -> int:
         """
-        The card size.
+        Number of rows on the card.
 
         Returns
         -------
         int
-            The card size.
+            Number of rows on the card.
         """
-        return self._size
+        return self._lines.height
+
+    @property
+    def width(self) -> int:
+        """
+        Number of columns on the card.
+
+        Returns
+        -------
+        int
+            Number of columns on the card.
+        """
+        return self._lines.width
+
+    @property
+    def line_masks(self) -> tuple[int, ...]:
+        """
+        Masks of the winning lines as plain integers.
+
+        Returns
+        -------
+        tuple[int]
+            Masks of the winning lines; their set bits correspond to
+            the square IDs that make up a line.
+        """
+        return self._lines.masks
 
     @property
     def state(self) -> int:
@@ -180,7 +636,7 @@ class CardBase:
             IDs of the blank squares on the card.
         """
 
-        return _find_ones(~self.state & ((1 << self.size**2) - 1))
+        return _find_ones(~self._state & ((1 << self._lines.n) - 1))
 
     @property
     def filled(self) -> tuple[int, ...]:
@@ -193,7 +649,20 @@ class CardBase:
             IDs of the filled squares on the card.
         """
 
-        return tuple(i for i in _find_ones(self.state) if i not in self.free)
+        return _find_ones(self._state & ~self._layout._mask)
+
+    @property
+    def layout(self) -> FreeLayout:
+        """
+        The layout of the free squares, which can be passed as `free` to build
+        other cards.
+
+        Returns
+        -------
+        FreeLayout
+            The layout of the free squares on the card.
+        """
+        return self._layout
 
     @property
     def free(self) -> tuple[int, ...]:
@@ -217,32 +686,13 @@ class CardBase:
         square : int
             The ID of the square.
         """
-        if 0 <= square < self.size**2:
+        if 0 <= square < self._lines.n:
             self._state |= 1 << square
 
-    def analyze_lines(self, k: int) -> tuple[enum.IntEnum, ...]:
-        """
-        Find out lines each of which is filled with `k` squares.
-
-        Parameters
-        ----------
-        k : int
-            Number of filled squares in a line.
-
-        Returns
-        -------
-        tuple
-            A tuple of `LineMask_{size}` members corresponding to the lines
-            with `k` filled squares.
-        """
-        from collections.abc import Iterable
-        from typing import cast
-
-        return tuple(
-            mask
-            for mask in cast(Iterable[enum.IntEnum], line_mask(self.size))
-            if (self.state & mask).bit_count() == k
-        )
+    def _missing_values(self, k: int) -> tuple[int, ...]:
+        # Masks of the lines missing `k` squares
+        missing = self._lines.missing(self._state)
+        return tuple(mask for mask, m in zip(self._lines.masks, missing) if m == k)
 
     def is_bingo(self, k: int = 1) -> bool:
         """
@@ -261,7 +711,7 @@ class CardBase:
 
         if k < 0:
             raise ValueError("negative value")
-        return len(self.analyze_lines(self.size)) >= k
+        return self._lines.missing(self._state).count(0) >= k
 
     def is_ready(self) -> bool:
         """
@@ -275,7 +725,7 @@ class CardBase:
             of a line when it is filled.
         """
 
-        return bool(self.analyze_lines(self.size - 1))
+        return 1 in self._lines.missing(self._state)
 
     def last_pieces_for_bingo(self) -> tuple[int, ...]:
         """
@@ -288,11 +738,9 @@ class CardBase:
             a line if it is filled.
         """
 
-        from functools import reduce
-        from operator import or_
-
-        p = ((self.state & mask) ^ mask for mask in self.analyze_lines(self.size - 1))
-        a = reduce(or_, p, 0)
+        a = 0
+        for mask in self._missing_values(1):
+            a |= mask & ~self._state
         return _find_ones(a)
 
     def show(
@@ -312,34 +760,25 @@ class CardBase:
             String for free squares, by default "\U0001F193" (Squared Free)
         """
 
-        s = ""
-        m = self.size
-        for row in range(m):
-            for col in range(m):
-                square = col * m + row
-                if square in self.free:
-                    s += free
-                    continue
-                if self._state & (1 << square):
-                    s += filled
-                else:
-                    s += blank
-            s += "\n"
-        print(s, end="")
+        from .render import render
 
+        print(render(self, blank=blank, filled=filled, free=free), end="")
 
-class Card(CardBase):
+
+class CardBase(GridCardBase):
     """
-    This class represents a concrete bingo card.
-    Each non-free square has its own label in addition to the four important attributes:
+    This is the base class that represents a bingo card.
+
+    A card has four important attributes:
     * size
     * state
     * square IDs
     * free squares
 
-    which are defined in `CardBase`. This new property allows you to
-    fill any square with a particular label by specifying the label.
-
+    If a card has a size of `n`, that means the card has `n*n` squares.
+    The state of a card shows which squares are filled and which are not.
+    It is an `n*n`-bit integer and its set bits correspond to filled squares.
+    The `k`-th bit of a state integer means the square with the ID of `k`.
     For example, on a bingo card of size 5, the IDs are arranged as follows.
 
         0 5 10 15 20
@@ -348,53 +787,221 @@ class Card(CardBase):
         3 8 13 18 23
         4 9 14 19 24
 
-    In this case, custom labels are arranged as follows.
-
-        <label of ID 0> ... <label of ID 20>
-        <label of ID 1> ... <label of ID 21>
-        <label of ID 2> ... <label of ID 22>
-        <label of ID 3> ... <label of ID 23>
-        <label of ID 4> ... <label of ID 24>
-
-    If the squares with ID 3 and 20 are free, they have no labels.
-
-        <label of ID 0> ...      <FREE>
-        <label of ID 1> ... <label of ID 21>
-        <label of ID 2> ... <label of ID 22>
-             <FREE>     ... <label of ID 23>
-        <label of ID 4> ... <label of ID 24>
+    The winning lines are the members of `line_mask(size)`.
+    Cards are equal if they have the same class, size, state and free squares,
+    and cards that are equal have the same hash. Note that filling a square
+    changes the hash of a card.
     """
 
     def __init__(
         self,
         size: int,
-        labels: collections.abc.Iterable[object],
         state: int = 0,
-        free: collections.abc.Iterable[int] = (),
+        free: collections.abc.Iterable[int] | FreeLayout = (),
     ):
         """
         Parameters
         ----------
         size : int
             Card's size
-        labels : Iterable[object]
-            Labels of non-free squares, in order of increasing ID.
         state : int, optional
             Initial state, by default 0
-        free : Iterable[int], optional
+        free : Iterable[int] or FreeLayout, optional
             IDs of free squares, by default ()
+        """
+        if size < 2:
+            raise ValueError("size must be greater than or equal to 2")
+        self._size = size
+        self._setup(_LineTableFactory.square(size), state, free)
 
-        See Also
-        --------
-        CardBase :
-            Defining the structure of a card and the meaning of
-            the parameters, except `labels`, are the same.
+    @property
+    def size(self) -> int:
         """
+        The card size.
 
-        super().__init__(size, state=state, free=free)
+        Returns
+        -------
+        int
+            The card size.
+        """
+        return self._size
+
+    def analyze_lines(self, k: int) -> tuple[enum.IntEnum, ...]:
+        """
+        Find out lines each of which is filled with `k` squares.
+
+        Parameters
+        ----------
+        k : int
+            Number of filled squares in a line.
+
+        Returns
+        -------
+        tuple
+            A tuple of `LineMask_{size}` members corresponding to the lines
+            with `k` filled squares.
+        """
+        from collections.abc import Iterable
+        from typing import cast
+
+        missing = self._lines.missing(self._state)
+        return tuple(
+            mask
+            for mask, m in zip(
+                cast("Iterable[enum.IntEnum]", line_mask(self.size)), missing
+            )
+            if m == self._size - k
+        )
+
+    def _analyze_line_values(self, k: int) -> tuple[int, ...]:
+        # Same as `analyze_lines`, but without creating `LineMask_{size}`.
+        return self._missing_values(self._size - k)
+
+
+class LabelVocabulary:
+    """
+    This class maps labels to small integer IDs.
+
+    Sharing one vocabulary among the cards of a game means that each label
+    is hashed once per lookup, instead of being compared with the label of
+    every square. IDs are assigned from 0 in order of first appearance.
+    Labels must be hashable.
+    """
+
+    def __init__(self, labels: collections.abc.Iterable[object] = ()):
+        """
+        Parameters
+        ----------
+        labels : Iterable[object], optional
+            Labels to intern in advance, by default ()
+        """
+        self._ids: dict[object, int] = dict()
+        self._labels: list[object] = []
+
+        for label in labels:
+            self.intern(label)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __contains__(self, label: object) -> bool:
+        return label in self._ids
+
+    def intern(self, label: object) -> int:
+        """
+        Return the ID of a label, assigning a new one if it is not known yet.
+
+        Parameters
+        ----------
+        label : object
+            The label.
+
+        Returns
+        -------
+        int
+            The label's ID.
+        """
+        r = self._ids.get(label)
+        if r is None:
+            r = self._ids[label] = len(self._labels)
+            self._labels.append(label)
+        return r
+
+    def lookup(self, label: object) -> int | None:
+        """
+        Return the ID of a label without assigning a new one.
+
+        Parameters
+        ----------
+        label : object
+            The label.
+
+        Returns
+        -------
+        int or None
+            The label's ID, or `None` if it is not known.
+        """
+        return self._ids.get(label)
+
+    def label(self, label_id: int) -> object:
+        """
+        Return the label whose ID is `label_id`.
+
+        Parameters
+        ----------
+        label_id : int
+            The ID of the label.
+
+        Returns
+        -------
+        object
+            The label.
+        """
+        if not (0 <= label_id < len(self._labels)):
+            raise ValueError("out of range")
+        return self._labels[label_id]
+
+
+class GridCard(GridCardBase):
+    """
+    This is the base class of cards with labels, such as `Card` and
+    `VariantCard`. Each non-free square has its own label, which allows you to
+    fill any square with a particular label by specifying the label.
 
-        sq_id_it = filter(lambda x: x not in free, range(size**2))
-        self._square_table = dict(zip(sq_id_it, labels, strict=True))
+    Unlike `GridCardBase`, cards are equal only if their labels are also equal.
+    """
+
+    def _setup_labels(
+        self,
+        labels: collections.abc.Iterable[object],
+        vocabulary: LabelVocabulary | None,
+    ):
+        # Called by the constructors of subclasses after `_setup`
+        sq_id_it = self._layout._squares
+        self._vocabulary = vocabulary
+
+        if vocabulary is None:
+            self._square_table = dict(zip(sq_id_it, labels, strict=True))
+            return
+
+        from array import array
+
+        # label ID of each square, or -1 for free squares
+        self._label_ids = array("i", [-1]) * self._lines.n
+        # label ID -> squares with the label
+        self._id_masks: dict[int, int] = dict()
+
+        for square, label in zip(sq_id_it, labels, strict=True):
+            label_id = vocabulary.intern(label)
+            self._label_ids[square] = label_id
+            self._id_masks[label_id] = self._id_masks.get(label_id, 0) | 1 << square
+
+    def __eq__(self, other: object) -> bool:
+        # Labels are compared too, but not hashed since they may be unhashable.
+        if not isinstance(other, GridCard) or type(other) is not type(self):
+            return NotImplemented
+        return super().__eq__(other) is True and self._table() == other._table()
+
+    def _table(self) -> dict[int, object]:
+        # Labels of non-free squares by square ID
+        if self._vocabulary is None:
+            return self._square_table
+        labels = self._vocabulary._labels
+        return {sq: labels[i] for sq, i in enumerate(self._label_ids) if i >= 0}
+
+    @property
+    def vocabulary(self) -> LabelVocabulary | None:
+        """
+        The vocabulary the labels are interned into.
+
+        Returns
+        -------
+        LabelVocabulary or None
+            The vocabulary, or `None` if the card stores labels as they are.
+        """
+        return self._vocabulary
+
+    __hash__ = GridCardBase.__hash__
 
     def label(self, square: int) -> object:
         """
@@ -411,9 +1018,12 @@ class Card(CardBase):
             The square's label.
         """
 
-        if not (0 <= square < self.size**2):
+        if not (0 <= square < self._lines.n):
             raise ValueError("out of range")
 
+        if self._vocabulary is not None:
+            label_id = self._label_ids[square]
+            return None if label_id < 0 else self._vocabulary.label(label_id)
         return self._square_table.get(square)
 
     def fill_by_label(self, label: object):
@@ -426,6 +1036,137 @@ class Card(CardBase):
             The label of the square.
         """
 
+        if self._vocabulary is not None:
+            label_id = self._vocabulary.lookup(label)
+            if label_id is not None:
+                self._state |= self._id_masks.get(label_id, 0)
+            return
+
         for k, v in self._square_table.items():
             if label == v:
                 self.fill(k)
+
+    def fill_by_id(self, label_id: int):
+        """
+        Fill all squares whose label has the ID of `label_id` in the card's
+        vocabulary if they exist on the card.
+
+        Parameters
+        ----------
+        label_id : int
+            The ID of the label.
+        """
+
+        if self._vocabulary is None:
+            raise ValueError("the card has no vocabulary")
+        self._state |= self._id_masks.get(label_id, 0)
+
+    def label_masks(self) -> dict[object, int]:
+        """
+        Return the squares with each label, which must be hashable.
+        Filling a card with a label is the same as OR-ing its mask into
+        the state.
+
+        Returns
+        -------
+        dict[object, int]
+            A dictionary from labels to integers whose set bits correspond to
+            the squares with the label.
+        """
+
+        if self._vocabulary is not None:
+            labels = self._vocabulary._labels
+            return {labels[i]: mask for i, mask in self._id_masks.items()}
+
+        r: dict[object, int] = dict()
+        for square, label in self._square_table.items():
+            r[label] = r.get(label, 0) | 1 << square
+        return r
+
+
+def _label_index(
+    label_masks: collections.abc.Iterable[dict[object, int]], start: int = 0
+) -> dict[object, list[tuple[int, int]]]:
+    # label -> [(card index, squares with the label), ...] from `label_masks()`
+    # of cards numbered from `start`
+    r: dict[object, list[tuple[int, int]]] = dict()
+
+    for i, masks in enumerate(label_masks, start):
+        for label, mask in masks.items():
+            r.setdefault(label, []).append((i, mask))
+    return r
+
+
+class Card(GridCard, CardBase):
+    """
+    This class represents a concrete bingo card.
+    Each non-free square has its own label in addition to the four important attributes:
+    * size
+    * state
+    * square IDs
+    * free squares
+
+    which are defined in `CardBase`. This new property allows you to
+    fill any square with a particular label by specifying the label.
+
+    For example, on a bingo card of size 5, the IDs are arranged as follows.
+
+        0 5 10 15 20
+        1 6 11 16 21
+        2 7 12 17 22
+        3 8 13 18 23
+        4 9 14 19 24
+
+    In this case, custom labels are arranged as follows.
+
+        <label of ID 0> ... <label of ID 20>
+        <label of ID 1> ... <label of ID 21>
+        <label of ID 2> ... <label of ID 22>
+        <label of ID 3> ... <label of ID 23>
+        <label of ID 4> ... <label of ID 24>
+
+    If the squares with ID 3 and 20 are free, they have no labels.
+
+        <label of ID 0> ...      <FREE>
+        <label of ID 1> ... <label of ID 21>
+        <label of ID 2> ... <label of ID 22>
+             <FREE>     ... <label of ID 23>
+        <label of ID 4> ... <label of ID 24>
+
+    Unlike `CardBase`, cards are equal only if their labels are also equal.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        labels: collections.abc.Iterable[object],
+        state: int = 0,
+        free: collections.abc.Iterable[int] | FreeLayout = (),
+        vocabulary: LabelVocabulary | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        size : int
+            Card's size
+        labels : Iterable[object]
+            Labels of non-free squares, in order of increasing ID.
+        state : int, optional
+            Initial state, by default 0
+        free : Iterable[int] or FreeLayout, optional
+            IDs of free squares, by default ()
+        vocabulary : LabelVocabulary, optional
+            Vocabulary to intern the labels into, by default None.
+            If it is given, the card stores label IDs instead of labels
+            and `fill_by_label` looks labels up by hash instead of comparing
+            them with `==`.
+
+        See Also
+        --------
+        CardBase :
+            Defining the structure of a card and the meaning of
+            the parameters, except `labels`, are the same.
+        """
+
+        super().__init__(size, state=state, free=free)
+        self._setup_labels(labels, vocabulary)
@@ -0,0 +1,252 @@
+import collections.abc
+import random
+import time
+import typing
+
+from . import card as _card
+from .card import Card, CardBase, LineAnalysisCache, line_analysis_cache
+
+
+class Case(typing.NamedTuple):
+    """
+    A randomly generated input.
+    """
+
+    size: int
+    """Card's size"""
+    state: int
+    """Initial state, not including free squares"""
+    free: tuple[int, ...]
+    """IDs of free squares, possibly unsorted and repeated"""
+    labels: tuple[int, ...]
+    """Labels of non-free squares, in order of increasing ID"""
+    k: int
+    """Argument of `analyze_lines` and `is_bingo`"""
+    label: int
+    """Argument of `fill_by_label`"""
+
+
+def _analyze_lines(c: Case) -> tuple[int, ...]:
+    return tuple(int(m) for m in CardBase(c.size, c.state, c.free).analyze_lines(c.k))
+
+
+def _fill_by_label(c: Case) -> int:
+    card = Card(c.size, c.labels, c.state, c.free)
+    card.fill_by_label(c.label)
+    return card.state
+
+
+_Impl = collections.abc.Callable[[Case], object]
+
+REFERENCE: dict[str, _Impl] = {
+    "analyze_lines": _analyze_lines,
+    "is_bingo": lambda c: CardBase(c.size, c.state, c.free).is_bingo(c.k),
+    "is_ready": lambda c: CardBase(c.size, c.state, c.free).is_ready(),
+    "last_pieces_for_bingo": lambda c: CardBase(
+        c.size, c.state, c.free
+    ).last_pieces_for_bingo(),
+    "blank": lambda c: CardBase(c.size, c.state, c.free).blank,
+    "filled": lambda c: CardBase(c.size, c.state, c.free).filled,
+    "fill_by_label": _fill_by_label,
+}
+"""
+Reference implementation of each operation, built on `CardBase` and `Card`.
+`analyze_lines` returns plain integers. `Harness.run` times it with the line
+analysis cache disabled.
+"""
+
+
+class Result(typing.NamedTuple):
+    """
+    The outcome of checking an implementation.
+    """
+
+    operation: str
+    """Name of the operation"""
+    name: str
+    """Name of the implementation"""
+    cases: int
+    """Number of cases checked"""
+    mismatches: list[tuple[Case, object, object]]
+    """`(case, expected, actual)` of the cases that did not match"""
+    reference_time: float
+    """Time the reference took for all cases, in seconds"""
+    time: float
+    """Time the implementation took for all cases, in seconds"""
+
+    @property
+    def ok(self) -> bool:
+        """Whether all cases matched"""
+        return not self.mismatches
+
+    @property
+    def speedup(self) -> float:
+        """Ratio of the reference's time to the implementation's"""
+        return self.reference_time / self.time if self.time else float("inf")
+
+
+def random_case(rng: random.Random, max_size: int = 9) -> Case:
+    """
+    Generate a random case.
+
+    Parameters
+    ----------
+    rng : random.Random
+        Random number generator
+    max_size : int, optional
+        Maximum size of a card, by default 9
+
+    Returns
+    -------
+    Case
+        The case.
+    """
+    size = rng.randint(2, max_size)
+    n = size**2
+
+    # Bias towards nearly filled cards, which have more lines to report.
+    state = rng.getrandbits(n)
+    for _ in range(rng.randint(0, 3)):
+        state |= rng.getrandbits(n)
+    free = tuple(rng.randrange(n) for _ in range(rng.choice((0, 0, 1, 1, 2, 5))))
+    n_labels = n - len(set(free))
+    # Few distinct labels, so that some of them appear more than once.
+    labels = tuple(rng.randrange(n_labels + 2) for _ in range(n_labels))
+    k = rng.randint(-1, 2 * size + 3)
+    label = rng.randrange(n_labels + 3)
+    return Case(size, state, free, labels, k, label)
+
+
+def _outcome(func: _Impl, case: Case) -> object:
+    # A return value, or the type of a raised exception
+    try:
+        return func(case)
+    except Exception as e:
+        return type(e)
+
+
+class Harness:
+    """
+    This class checks implementations of card operations against `REFERENCE`.
+
+    An implementation is a function that takes a `Case` and returns the
+    same as its reference, or raises an exception of the same type.
+    Every registered implementation is run on the same random cases, and
+    the time it takes is compared with that of the reference. Cards look up
+    a private line analysis cache during each timed pass: a disabled one for
+    the reference and an empty one for an implementation, so that neither is
+    timed on analyses cached by an earlier pass. `line_analysis_cache` is
+    left as it is, but it is not used by cards while `run` is running.
+    """
+
+    def __init__(self, seed: int | None = None, max_size: int = 9):
+        """
+        Parameters
+        ----------
+        seed : int, optional
+            Seed of the random cases, by default None
+        max_size : int, optional
+            Maximum size of a card, by default 9
+        """
+        if max_size < 2:
+            raise ValueError("max_size must be greater than or equal to 2")
+        self._seed = seed
+        self._max_size = max_size
+        self._impls: list[tuple[str, str, _Impl]] = []
+
+    def register(
+        self,
+        operation: str,
+        name: str,
+        func: _Impl,
+    ):
+        """
+        Register an implementation of an operation.
+
+        Parameters
+        ----------
+        operation : str
+            Name of the operation; one of the keys of `REFERENCE`
+        name : str
+            Name of the implementation
+        func : Callable[[Case], object]
+            The implementation
+        """
+        if operation not in REFERENCE:
+            raise ValueError(f"unknown operation: {operation!r}")
+        self._impls.append((operation, name, func))
+
+    def run(self, n: int = 1000, max_mismatches: int = 10) -> list[Result]:
+        """
+        Check all registered implementations.
+
+        Parameters
+        ----------
+        n : int, optional
+            Number of random cases, by default 1000
+        max_mismatches : int, optional
+            Maximum number of mismatches kept per implementation, by default 10
+
+        Returns
+        -------
+        list[Result]
+            Results in order of registration.
+        """
+        rng = random.Random(self._seed)
+        cases = [random_case(rng, self._max_size) for _ in range(n)]
+        expected: dict[str, tuple[list[object], float]] = dict()
+        r = []
+        previous = _card._active_cache
+
+        try:
+            for operation, name, func in self._impls:
+                if operation not in expected:
+                    ref = REFERENCE[operation]
+                    _card._use_cache(LineAnalysisCache(0))
+                    t = time.perf_counter()
+                    values = [_outcome(ref, case) for case in cases]
+                    expected[operation] = (values, time.perf_counter() - t)
+                values, ref_time = expected[operation]
+
+                _card._use_cache(LineAnalysisCache(line_analysis_cache.maxsize))
+                t = time.perf_counter()
+                actual = [_outcome(func, case) for case in cases]
+                elapsed = time.perf_counter() - t
+
+                mismatches = [
+                    (case, e, a) for case, e, a in zip(cases, values, actual) if e != a
+                ]
+                r.append(
+                    Result(
+                        operation,
+                        name,
+                        n,
+                        mismatches[:max_mismatches],
+                        ref_time,
+                        elapsed,
+                    )
+                )
+        finally:
+            _card._use_cache(previous)
+        return r
+
+
+def report(results: collections.abc.Iterable[Result]) -> str:
+    """
+    Format results as a table.
+
+    Parameters
+    ----------
+    results : Iterable[Result]
+        Results returned by `Harness.run`
+
+    Returns
+    -------
+    str
+        One line per result with its correctness and speedup.
+    """
+    return "".join(
+        f"{x.operation:<22} {x.name:<24} {'ok' if x.ok else 'MISMATCH':<8}"
+        f" {x.cases:>7} cases  x{x.speedup:.2f}\n"
+        for x in results
+    )
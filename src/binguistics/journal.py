@@ -0,0 +1,324 @@
+import collections.abc
+import io
+import os
+import pickle
+import struct
+
+from .card import GridCard, LabelVocabulary
+
+_HEADER = struct.Struct("<I")
+# journal offset, number of cards and bytes per state of a snapshot
+_SNAPSHOT = struct.Struct("<QII")
+
+
+class _Pickler(pickle.Pickler):
+    # Stores vocabularies as their index in the hall, since they are
+    # journaled separately and shared by cards.
+
+    def __init__(self, f: io.BytesIO, vocabulary_ids: dict[int, int]):
+        super().__init__(f)
+        self._vocabulary_ids = vocabulary_ids
+
+    def persistent_id(self, obj: object) -> int | None:
+        if isinstance(obj, LabelVocabulary):
+            return self._vocabulary_ids[id(obj)]
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    # Restores vocabularies stored by `_Pickler`
+
+    def __init__(self, f: io.BytesIO, vocabularies: list[LabelVocabulary]):
+        super().__init__(f)
+        self._vocabularies = vocabularies
+
+    def persistent_load(self, pid: int) -> LabelVocabulary:
+        return self._vocabularies[pid]
+
+
+class JournaledHall:
+    """
+    This class represents a hall of cards whose progress survives crashes.
+
+    Every card registration and every draw is appended to a journal file
+    before it is applied. A card is journaled once, with its vocabulary
+    journaled separately, so that cards sharing a vocabulary still share it
+    after recovery. From time to time, the states of all cards are written
+    to a snapshot file, packed as by `stream.write_states`, together with
+    the position in the journal they correspond to. `recover` reads the
+    cards and draws from the journal, but fills only the cards with the
+    draws written after the latest snapshot, so recovery takes time
+    proportional to that tail rather than to the whole game.
+
+    Both files are in `directory`: "journal" and "snapshot". Cards and labels
+    are stored with `pickle`, so only recover from files you trust.
+    """
+
+    JOURNAL = "journal"
+    SNAPSHOT = "snapshot"
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        snapshot_every: int = 100,
+        fsync: bool = False,
+    ):
+        """
+        Start a new game, discarding any files of a previous one in `directory`.
+
+        Parameters
+        ----------
+        directory : str or os.PathLike
+            Directory for the journal and snapshot files; it is created if
+            it does not exist.
+        snapshot_every : int, optional
+            Take a snapshot after every this many draws, by default 100;
+            0 disables automatic snapshots.
+        fsync : bool, optional
+            Whether to force every record to disk, by default False, which
+            survives a crash of the process but not of the machine.
+        """
+        self._setup(directory, snapshot_every, fsync)
+        os.makedirs(self._directory, exist_ok=True)
+        try:
+            os.remove(os.path.join(self._directory, self.SNAPSHOT))
+        except FileNotFoundError:
+            pass
+        self._journal = open(os.path.join(self._directory, self.JOURNAL), "w+b")
+
+    def _setup(self, directory: str | os.PathLike, snapshot_every: int, fsync: bool):
+        if snapshot_every < 0:
+            raise ValueError("negative value")
+        self._directory = os.fspath(directory)
+        self._snapshot_every = snapshot_every
+        self._fsync = fsync
+        self._cards: dict[object, GridCard] = dict()
+        self._draws: list[object] = []
+        self._since_snapshot = 0
+
+        # vocabularies of the cards by their index
+        self._vocabularies: list[LabelVocabulary] = []
+        # id of a vocabulary -> its index
+        self._vocabulary_ids: dict[int, int] = dict()
+        # number of labels of each vocabulary in the journal
+        self._journaled: list[int] = []
+
+    @classmethod
+    def recover(
+        cls,
+        directory: str | os.PathLike,
+        snapshot_every: int = 100,
+        fsync: bool = False,
+    ) -> "JournaledHall":
+        """
+        Restore a game from the files in `directory` and continue it.
+
+        A record cut off by a crash at the end of the journal is discarded.
+
+        Parameters
+        ----------
+        directory : str or os.PathLike
+            Directory for the journal and snapshot files
+        snapshot_every : int, optional
+            Take a snapshot after every this many draws, by default 100;
+            0 disables automatic snapshots.
+        fsync : bool, optional
+            Whether to force every record to disk, by default False
+
+        Returns
+        -------
+        JournaledHall
+            The restored hall.
+        """
+        from .stream import _read_packed
+
+        self = cls.__new__(cls)
+        self._setup(directory, snapshot_every, fsync)
+        snapshot_offset = 0
+        states: list[int] = []
+
+        try:
+            with open(os.path.join(self._directory, self.SNAPSHOT), "rb") as f:
+                snapshot_offset, n_cards, nbytes = _SNAPSHOT.unpack(
+                    f.read(_SNAPSHOT.size)
+                )
+                states = list(_read_packed(f, nbytes))
+            if len(states) != n_cards:
+                raise ValueError("truncated snapshot")
+        except FileNotFoundError:
+            pass
+
+        path = os.path.join(self._directory, self.JOURNAL)
+        offset = 0
+
+        with open(path, "rb") as f:
+            while True:
+                if offset == snapshot_offset and states:
+                    for card, state in zip(self._cards.values(), states):
+                        card._state = state
+                    states = []
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                (n,) = _HEADER.unpack(header)
+                data = f.read(n)
+                if len(data) < n:
+                    break
+                record = _Unpickler(io.BytesIO(data), self._vocabularies).load()
+                if offset >= snapshot_offset:
+                    self._apply(record)
+                elif record[0] == "draw":
+                    # Already filled in the snapshot
+                    self._draws.append(record[1])
+                else:
+                    self._define(record)
+                offset += _HEADER.size + n
+
+        if offset < snapshot_offset:
+            raise ValueError("the snapshot is ahead of the journal")
+
+        self._journal = open(path, "r+b")
+        self._journal.truncate(offset)
+        self._journal.seek(offset)
+        return self
+
+    def __enter__(self) -> "JournaledHall":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def cards(self) -> collections.abc.Mapping[object, GridCard]:
+        """
+        Registered cards by their IDs.
+
+        Returns
+        -------
+        Mapping[object, GridCard]
+            Registered cards by their IDs, in order of registration.
+        """
+        return self._cards
+
+    @property
+    def draws(self) -> tuple[object, ...]:
+        """
+        Drawn labels.
+
+        Returns
+        -------
+        tuple[object]
+            Drawn labels, in order.
+        """
+        return tuple(self._draws)
+
+    def _define(self, record: tuple):
+        # Apply a record of a card or labels of a vocabulary
+        if record[0] == "card":
+            _, card_id, card = record
+            self._cards[card_id] = card
+        else:
+            _, index, labels = record
+            if index == len(self._vocabularies):
+                self._add_vocabulary(LabelVocabulary())
+            vocabulary = self._vocabularies[index]
+            for label in labels:
+                vocabulary.intern(label)
+            self._journaled[index] += len(labels)
+
+    def _add_vocabulary(self, vocabulary: LabelVocabulary):
+        self._vocabulary_ids[id(vocabulary)] = len(self._vocabularies)
+        self._vocabularies.append(vocabulary)
+        self._journaled.append(0)
+
+    def _apply(self, record: tuple):
+        if record[0] != "draw":
+            self._define(record)
+            return
+        _, label = record
+        self._draws.append(label)
+        for card in self._cards.values():
+            card.fill_by_label(label)
+
+    def _append(self, record: tuple):
+        f = io.BytesIO()
+        _Pickler(f, self._vocabulary_ids).dump(record)
+        data = f.getvalue()
+        self._journal.write(_HEADER.pack(len(data)) + data)
+        self._journal.flush()
+        if self._fsync:
+            os.fsync(self._journal.fileno())
+
+    def register(self, card_id: object, card: GridCard):
+        """
+        Add a card to the hall. Labels drawn so far are not filled on it.
+
+        Parameters
+        ----------
+        card_id : object
+            Unique and hashable ID of the card
+        card : GridCard
+            The card
+        """
+        if card_id in self._cards:
+            raise ValueError(f"card {card_id!r} is already registered")
+
+        vocabulary = card.vocabulary
+        if vocabulary is not None:
+            new = id(vocabulary) not in self._vocabulary_ids
+            if new:
+                self._add_vocabulary(vocabulary)
+            index = self._vocabulary_ids[id(vocabulary)]
+            # Labels interned since the vocabulary was last journaled
+            labels = tuple(vocabulary._labels[self._journaled[index] :])
+            if labels or new:
+                self._append(("labels", index, labels))
+                self._apply(("labels", index, labels))
+
+        record = ("card", card_id, card)
+        self._append(record)
+        self._apply(record)
+
+    def draw(self, label: object):
+        """
+        Fill all cards with a drawn label.
+
+        Parameters
+        ----------
+        label : object
+            The drawn label.
+        """
+        record = ("draw", label)
+        self._append(record)
+        self._apply(record)
+
+        self._since_snapshot += 1
+        if self._snapshot_every and self._since_snapshot >= self._snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """
+        Write the states of all cards to the snapshot file, replacing the
+        previous one atomically.
+        """
+        from .stream import _write_packed
+
+        path = os.path.join(self._directory, self.SNAPSHOT)
+        tmp = path + ".tmp"
+        cards = self._cards.values()
+        nbytes = max((c._lines.n + 7) // 8 for c in cards) if cards else 1
+
+        with open(tmp, "wb") as f:
+            f.write(_SNAPSHOT.pack(self._journal.tell(), len(cards), nbytes))
+            _write_packed(f, (c.state for c in cards), nbytes)
+            f.flush()
+            if self._fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+        self._since_snapshot = 0
+
+    def close(self):
+        """
+        Close the journal file.
+        """
+        self._journal.close()
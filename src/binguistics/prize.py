@@ -0,0 +1,219 @@
+import collections.abc
+import typing
+
+from .card import GridCard, _label_index
+
+
+class Prize(typing.NamedTuple):
+    """
+    A prize of a session.
+    """
+
+    name: str
+    """Name of the prize"""
+    lines: int | None
+    """Number of fully filled lines to win it, or None for all lines"""
+
+
+ONE_LINE = Prize("one line", 1)
+TWO_LINES = Prize("two lines", 2)
+FULL_HOUSE = Prize("full house", None)
+
+LADDER = (ONE_LINE, TWO_LINES, FULL_HOUSE)
+"""One line, then two lines, then full house."""
+
+
+class Award(typing.NamedTuple):
+    """
+    A prize settled on a draw.
+    """
+
+    prize: Prize
+    """The prize"""
+    winners: tuple[int, ...]
+    """Indices of the cards sharing the prize, in increasing order"""
+
+    @property
+    def share(self) -> float:
+        """Fraction of the prize each winner receives"""
+        return 1 / len(self.winners)
+
+
+class DrawResult(typing.NamedTuple):
+    """
+    The result of a draw.
+    """
+
+    label: object
+    """The drawn label"""
+    awards: tuple[Award, ...]
+    """Prizes settled on the draw, in order of the ladder"""
+
+
+class PrizeLadder:
+    """
+    This class plays a session whose prizes are awarded one after another.
+
+    Only the first unsettled prize is open. It is settled on the first draw
+    where a card reaches it, and all cards reaching it on that draw share it.
+    The next prize opens immediately, so a draw completing two lines for the
+    first time settles both one line and two lines.
+
+    The tier of each card, the number of prizes on the ladder it has reached,
+    is kept up to date. A draw fills only the cards that have the label and
+    computes their line counts once, whatever the number of prizes.
+    """
+
+    def __init__(
+        self,
+        cards: collections.abc.Iterable[GridCard],
+        prizes: collections.abc.Iterable[Prize] = LADDER,
+    ):
+        """
+        Parameters
+        ----------
+        cards : Iterable[GridCard]
+            Cards in play, such as `Card` or `VariantCard`; they are filled
+            by `draw`, and labels must be hashable
+        prizes : Iterable[Prize], optional
+            Prizes in order of award, by default `LADDER`; the numbers of lines
+            must increase, and a prize for all lines can only come last.
+        """
+        self._cards = list(cards)
+        self._prizes = tuple(prizes)
+
+        if not self._prizes:
+            raise ValueError("no prizes")
+        for i, p in enumerate(self._prizes):
+            if p.lines is None:
+                if i != len(self._prizes) - 1:
+                    raise ValueError("a prize for all lines must come last")
+            elif p.lines < 1:
+                raise ValueError("lines must be positive")
+            elif i and p.lines <= typing.cast(int, self._prizes[i - 1].lines):
+                raise ValueError("lines must increase")
+
+        self._index = _label_index(c.label_masks() for c in self._cards)
+
+        self._tiers = [self._tier(c, 0) for c in self._cards]
+        self._settled: list[Award] = []
+
+        # Cards already at a tier before any draw compete on the first one.
+        self._carried = [i for i, t in enumerate(self._tiers) if t]
+
+    def _tier(self, card: GridCard, tier: int) -> int:
+        # Climb from `tier` with one line analysis
+        missing = card._lines.missing(card._state)
+        complete = missing.count(0)
+        prizes = self._prizes
+
+        while tier < len(prizes):
+            lines = prizes[tier].lines
+            if complete < (len(missing) if lines is None else lines):
+                break
+            tier += 1
+        return tier
+
+    @property
+    def cards(self) -> tuple[GridCard, ...]:
+        """
+        The cards in play.
+
+        Returns
+        -------
+        tuple[GridCard]
+            The cards, in the order they were given.
+        """
+        return tuple(self._cards)
+
+    @property
+    def prizes(self) -> tuple[Prize, ...]:
+        """
+        The prizes in order of award.
+
+        Returns
+        -------
+        tuple[Prize]
+            The prizes in order of award.
+        """
+        return self._prizes
+
+    @property
+    def tiers(self) -> tuple[int, ...]:
+        """
+        Number of prizes on the ladder each card has reached.
+
+        Returns
+        -------
+        tuple[int]
+            Tiers of the cards, in order.
+        """
+        return tuple(self._tiers)
+
+    @property
+    def awards(self) -> tuple[Award, ...]:
+        """
+        Prizes settled so far.
+
+        Returns
+        -------
+        tuple[Award]
+            Settled prizes, in order of the ladder.
+        """
+        return tuple(self._settled)
+
+    @property
+    def open_prize(self) -> Prize | None:
+        """
+        The prize to be settled next.
+
+        Returns
+        -------
+        Prize or None
+            The prize, or None if all prizes are settled.
+        """
+        n = len(self._settled)
+        return self._prizes[n] if n < len(self._prizes) else None
+
+    def draw(self, label: object) -> DrawResult:
+        """
+        Fill the cards with a drawn label and settle prizes.
+
+        Parameters
+        ----------
+        label : object
+            The drawn label.
+
+        Returns
+        -------
+        DrawResult
+            Prizes settled on the draw.
+        """
+        advanced = self._carried
+        self._carried = []
+        tiers = self._tiers
+        last = len(self._prizes)
+
+        for i, mask in self._index.get(label, ()):
+            c = self._cards[i]
+            if c._state & mask == mask:
+                continue
+            c._state |= mask
+            if tiers[i] < last:
+                tier = self._tier(c, tiers[i])
+                if tier > tiers[i]:
+                    tiers[i] = tier
+                    advanced.append(i)
+
+        awards = []
+
+        # A card that had reached the open prize before would have won it
+        # then, so only the cards advanced on this draw can win.
+        while advanced and (n := len(self._settled)) < last:
+            winners = tuple(sorted({i for i in advanced if tiers[i] > n}))
+            if not winners:
+                break
+            award = Award(self._prizes[n], winners)
+            self._settled.append(award)
+            awards.append(award)
+        return DrawResult(label, tuple(awards))
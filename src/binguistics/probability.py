@@ -0,0 +1,251 @@
+import collections.abc
+import math
+import random
+
+from .card import GridCard, _find_ones
+
+
+def _minimal(needs: collections.abc.Iterable[int]) -> tuple[int, ...]:
+    # Drop duplicates and supersets; a line that needs a superset of what
+    # another line needs never wins on its own.
+    r: list[int] = []
+
+    for need in sorted(set(needs), key=lambda x: (x.bit_count(), x)):
+        if all(need & x != x for x in r):
+            r.append(need)
+    return tuple(r)
+
+
+class WinProbability:
+    """
+    This class calculates the probability that cards reach bingo within
+    the next `m` calls.
+
+    Calls are assumed to be drawn uniformly at random, without replacement,
+    from the labels not called yet. A line is completed within `m` calls if
+    and only if the labels of all of its blank squares are among them.
+
+    For each card, the labels its lines still need are numbered in order of
+    increasing square ID, which turns the lines into a "need structure":
+    a tuple of bitmasks over those numbers. Cards with the same need
+    structure have the same probability, and the inclusion-exclusion
+    coefficients computed for one of them are shared with the others.
+    Only the coefficients of the `maxsize` most recently used need structures
+    are kept.
+
+    `sampled` draws from the remaining labels in the order they were given,
+    so a seeded `rng` gives the same results in every process.
+    """
+
+    maxsize = 4096
+
+    def __init__(self, remaining: collections.abc.Iterable[object]):
+        """
+        Parameters
+        ----------
+        remaining : Iterable[object]
+            Labels not called yet; they must be hashable.
+        """
+        # Labels are kept in the given order; only the keys are used.
+        self._remaining = dict.fromkeys(remaining)
+
+        # need structure -> (cap, coefficients); see `_coefficients`
+        self._memo: dict[tuple[int, ...], tuple[int, list[int]]] = dict()
+
+    @property
+    def remaining(self) -> frozenset[object]:
+        """
+        Labels not called yet.
+
+        Returns
+        -------
+        frozenset[object]
+            Labels not called yet.
+        """
+        return frozenset(self._remaining)
+
+    def call(self, label: object):
+        """
+        Remove a called label from the remaining labels.
+
+        Parameters
+        ----------
+        label : object
+            The called label.
+        """
+        self._remaining.pop(label, None)
+
+    def _needs(
+        self, card: GridCard, masks: collections.abc.Iterable[int] | None
+    ) -> tuple[tuple[object, ...], tuple[int, ...]] | None:
+        # (labels, need structure) of lines that can still be completed,
+        # or None if a line is already completed.
+        state = card.state
+        possible = []
+
+        for mask in card.line_masks if masks is None else masks:
+            blank = mask & ~state
+            if not blank:
+                return None
+            if all(card.label(i) in self._remaining for i in _find_ones(blank)):
+                possible.append(blank)
+
+        union = 0
+        for blank in possible:
+            union |= blank
+
+        labels: dict[object, int] = dict()
+        for square in _find_ones(union):
+            labels.setdefault(card.label(square), len(labels))
+
+        needs = []
+        for blank in possible:
+            need = 0
+            for square in _find_ones(blank):
+                need |= 1 << labels[card.label(square)]
+            needs.append(need)
+
+        return tuple(labels), _minimal(needs)
+
+    def _coefficients(self, needs: tuple[int, ...], cap: int) -> list[int]:
+        # c[k]: signed number of subsets of `needs` whose union has `k` labels,
+        # for k <= cap. Subsets with larger unions are pruned along with all
+        # their supersets, since they cannot be completed within `cap` calls.
+        memo = self._memo.pop(needs, None)
+        if memo is not None:
+            self._memo[needs] = memo
+            if memo[0] >= cap:
+                return memo[1]
+
+        c = [0] * (cap + 1)
+
+        def rec(i: int, union: int, sign: int):
+            for j in range(i, len(needs)):
+                u = union | needs[j]
+                k = u.bit_count()
+                if k > cap:
+                    continue
+                c[k] += sign
+                rec(j + 1, u, -sign)
+
+        rec(0, 0, 1)
+        self._memo.pop(needs, None)
+        if len(self._memo) >= self.maxsize:
+            del self._memo[next(iter(self._memo))]
+        self._memo[needs] = (cap, c)
+        return c
+
+    def exact(
+        self,
+        cards: collections.abc.Iterable[GridCard],
+        m: int,
+        masks: collections.abc.Iterable[int] | None = None,
+    ) -> tuple[float, ...]:
+        """
+        Calculate the exact probability that each card completes a line
+        within the next `m` calls, by inclusion-exclusion over its lines.
+
+        Parameters
+        ----------
+        cards : Iterable[GridCard]
+            Cards, such as `Card` or `VariantCard`, whose labels are hashable
+        m : int
+            Number of calls
+        masks : Iterable[int], optional
+            Winning patterns to use instead of the lines of each card,
+            by default None
+
+        Returns
+        -------
+        tuple[float]
+            The probabilities, in the same order as `cards`.
+        """
+
+        if m < 0:
+            raise ValueError("negative value")
+        if masks is not None:
+            masks = tuple(masks)
+        n = len(self._remaining)
+        m = min(m, n)
+        total = math.comb(n, m)
+        r = []
+
+        for card in cards:
+            x = self._needs(card, masks)
+            if x is None:
+                r.append(1.0)
+                continue
+            needs = tuple(need for need in x[1] if need.bit_count() <= m)
+            c = self._coefficients(needs, m)
+            numerator = sum(c[k] * math.comb(n - k, m - k) for k in range(m + 1))
+            r.append(numerator / total)
+        return tuple(r)
+
+    def sampled(
+        self,
+        cards: collections.abc.Iterable[GridCard],
+        m: int,
+        trials: int = 10000,
+        rng: random.Random | None = None,
+        masks: collections.abc.Iterable[int] | None = None,
+    ) -> tuple[float, ...]:
+        """
+        Estimate the probability that each card completes a line within
+        the next `m` calls, by simulating the calls. All cards are evaluated
+        against the same simulated calls.
+
+        Parameters
+        ----------
+        cards : Iterable[GridCard]
+            Cards, such as `Card` or `VariantCard`, whose labels are hashable
+        m : int
+            Number of calls
+        trials : int, optional
+            Number of simulations, by default 10000
+        rng : random.Random, optional
+            Random number generator, by default None, which means a new one
+        masks : Iterable[int], optional
+            Winning patterns to use instead of the lines of each card,
+            by default None
+
+        Returns
+        -------
+        tuple[float]
+            The estimated probabilities, in the same order as `cards`.
+        """
+
+        if m < 0 or trials <= 0:
+            raise ValueError("m must be non-negative and trials must be positive")
+        if masks is not None:
+            masks = tuple(masks)
+        if rng is None:
+            rng = random.Random()
+        pool = list(self._remaining)
+        m = min(m, len(pool))
+
+        # For each card, the sets of labels needed by its lines,
+        # or None if it has already completed a line.
+        card_needs: list[list[frozenset[object]] | None] = []
+
+        for card in cards:
+            x = self._needs(card, masks)
+            if x is None:
+                card_needs.append(None)
+                continue
+            labels, needs = x
+            card_needs.append(
+                [
+                    frozenset(labels[i] for i in _find_ones(need))
+                    for need in needs
+                    if need.bit_count() <= m
+                ]
+            )
+
+        wins = [0] * len(card_needs)
+
+        for _ in range(trials):
+            drawn = set(rng.sample(pool, m))
+            for i, needs_i in enumerate(card_needs):
+                if needs_i is None or any(need <= drawn for need in needs_i):
+                    wins[i] += 1
+        return tuple(w / trials for w in wins)
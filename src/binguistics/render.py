@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import operator
+
+from .card import GridCardBase, _find_ones
+
+# `show` renders cards through this module, so `collections.abc` is only
+# imported for type checking and `html`, which imports `re` and `enum`,
+# only when exporting.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    import collections.abc
+
+
+class _TemplateFactory:
+    # Each instance is a singleton.
+
+    _instances: dict[tuple[int, int], collections.abc.Callable] = dict()
+
+    @classmethod
+    def create(cls, height: int, width: int) -> collections.abc.Callable:
+        # Picks the characters of `format(state, f"0{n}b") + "\n"` in the
+        # order they are displayed; the square with the ID of `k` is at `n-1-k`.
+        n = height * width
+        indices = []
+
+        for row in range(height):
+            indices += [n - 1 - (col * height + row) for col in range(width)]
+            indices.append(n)
+        return operator.itemgetter(*indices)
+
+    @classmethod
+    def get(cls, height: int, width: int) -> collections.abc.Callable:
+        if (height, width) not in cls._instances:
+            cls._instances[height, width] = cls.create(height, width)
+        return cls._instances[height, width]
+
+
+def _symbols(card: GridCardBase, blank: str, filled: str, free: str) -> list[str]:
+    # Symbols of all squares in order of increasing ID
+    h, w = card.height, card.width
+    lookup = {"0": blank, "1": filled}
+    r = [lookup[b] for b in format(card.state, f"0{h * w}b")[::-1]]
+
+    for square in card.free:
+        r[square] = free
+    return r
+
+
+def render(
+    card: GridCardBase,
+    blank: str = "\u2B1A",
+    filled: str = "\u25A9",
+    free: str = "\U0001F193",
+) -> str:
+    """
+    Render a card as text, in the same format as `CardBase.show` prints it.
+
+    Parameters
+    ----------
+    card : CardBase or VariantCardBase
+        The card to render
+    blank : str, optional
+        String for blank squares, by default "\u2B1A" (Dotted Square)
+    filled : str, optional
+        String for filled squares, by default "\u25A9"
+        (Square with Diagonal Crosshatch Fill)
+    free : str, optional
+        String for free squares, by default "\U0001F193" (Squared Free)
+
+    Returns
+    -------
+    str
+        One line per row of the card, each terminated by a newline.
+    """
+
+    h, w = card.height, card.width
+    n = h * w
+    digits = bytearray(format(card.state, f"0{n}b"), "ascii")
+
+    for square in card.free:
+        digits[n - 1 - square] = ord("2")
+    digits.append(ord("\n"))
+
+    table = str.maketrans({"0": blank, "1": filled, "2": free})
+    return bytes(_TemplateFactory.get(h, w)(digits)).decode().translate(table)
+
+
+class CardView:
+    """
+    This class keeps the rendered text of a card up to date.
+
+    The text is the same as what `render` returns. After the card is filled,
+    `update` re-renders only the squares that have changed since the last
+    update and reports their IDs, so that clients can be sent just those.
+    """
+
+    def __init__(
+        self,
+        card: GridCardBase,
+        blank: str = "\u2B1A",
+        filled: str = "\u25A9",
+        free: str = "\U0001F193",
+    ):
+        """
+        Parameters
+        ----------
+        card : CardBase or VariantCardBase
+            The card to render
+        blank : str, optional
+            String for blank squares, by default "\u2B1A" (Dotted Square)
+        filled : str, optional
+            String for filled squares, by default "\u25A9"
+            (Square with Diagonal Crosshatch Fill)
+        free : str, optional
+            String for free squares, by default "\U0001F193" (Squared Free)
+        """
+
+        self._card = card
+        self._filled = filled
+        self._height, width = card.height, card.width
+        self._row_len = width + 1
+        self._state = card.state
+
+        symbols = _symbols(card, blank, filled, free)
+        self._pieces = []
+
+        for row in range(self._height):
+            self._pieces += symbols[row :: self._height]
+            self._pieces.append("\n")
+        self._text: str | None = None
+
+    @property
+    def card(self) -> GridCardBase:
+        """
+        The card being rendered.
+
+        Returns
+        -------
+        CardBase or VariantCardBase
+            The card being rendered.
+        """
+        return self._card
+
+    @property
+    def text(self) -> str:
+        """
+        The rendered text as of the last update.
+
+        Returns
+        -------
+        str
+            One line per row of the card, each terminated by a newline.
+        """
+        if self._text is None:
+            self._text = "".join(self._pieces)
+        return self._text
+
+    def update(self) -> tuple[int, ...]:
+        """
+        Re-render the squares filled since the last update.
+
+        Returns
+        -------
+        tuple[int]
+            IDs of the re-rendered squares.
+        """
+
+        changed = _find_ones(self._card.state & ~self._state)
+        if not changed:
+            return ()
+
+        h = self._height
+        for square in changed:
+            self._pieces[square % h * self._row_len + square // h] = self._filled
+        self._state = self._card.state
+        self._text = None
+        return changed
+
+
+def _cells(card: GridCardBase, free: str) -> list[tuple[str, bool]]:
+    # (text, filled) of all squares in order of increasing ID
+    h, w = card.height, card.width
+    label = getattr(card, "label", None)
+    state = card.state
+    r = [
+        ("" if label is None else str(label(i)), bool(state >> i & 1))
+        for i in range(h * w)
+    ]
+
+    for square in card.free:
+        r[square] = (free, False)
+    return r
+
+
+def export_text(
+    cards: collections.abc.Iterable[GridCardBase], free: str = "FREE", mark: str = "*"
+) -> str:
+    """
+    Export cards with their labels as plain text.
+
+    Each square is shown as its label, right-aligned to the widest one on
+    the card and followed by `mark` if it is filled. Cards are separated
+    by an empty line.
+
+    Parameters
+    ----------
+    cards : Iterable[CardBase or VariantCardBase]
+        Cards to export; cards without labels show empty squares.
+    free : str, optional
+        Text for free squares, by default "FREE"
+    mark : str, optional
+        Mark for filled squares, by default "*"
+
+    Returns
+    -------
+    str
+        The exported text.
+    """
+
+    r = []
+    space = " " * len(mark)
+
+    for card in cards:
+        h = card.height
+        cells = _cells(card, free)
+        width = max(len(t) for t, _ in cells)
+        lines = (
+            " ".join(
+                f"{t:>{width}}{mark if f else space}" for t, f in cells[row::h]
+            ).rstrip()
+            for row in range(h)
+        )
+        r.append("\n".join(lines) + "\n")
+    return "\n".join(r)
+
+
+def export_html(
+    cards: collections.abc.Iterable[GridCardBase], free: str = "FREE"
+) -> str:
+    """
+    Export cards with their labels as HTML tables.
+
+    Each card is a `<table class="card">` and each square is a `<td>` of class
+    "blank", "filled" or "free".
+
+    Parameters
+    ----------
+    cards : Iterable[CardBase or VariantCardBase]
+        Cards to export; cards without labels show empty squares.
+    free : str, optional
+        Text for free squares, by default "FREE"
+
+    Returns
+    -------
+    str
+        The exported HTML fragment.
+    """
+
+    import html
+
+    r = []
+    cls = ("blank", "filled")
+    free_td = f'<td class="free">{html.escape(free)}</td>'
+
+    for card in cards:
+        h = card.height
+        tds = [
+            f'<td class="{cls[f]}">{html.escape(t)}</td>' for t, f in _cells(card, "")
+        ]
+        for square in card.free:
+            tds[square] = free_td
+        r.append('<table class="card">\n')
+        r += ("<tr>" + "".join(tds[row::h]) + "</tr>\n" for row in range(h))
+        r.append("</table>\n")
+    return "".join(r)
+
+
+def export_svg(
+    cards: collections.abc.Iterable[GridCardBase], free: str = "FREE", cell: int = 40
+) -> str:
+    """
+    Export cards with their labels as an SVG document.
+
+    The cards are stacked vertically with a gap of one square between them.
+    Each square is a `<rect>` of class "blank", "filled" or "free" with its
+    label centered on it.
+
+    Parameters
+    ----------
+    cards : Iterable[CardBase or VariantCardBase]
+        Cards to export; cards without labels show empty squares.
+    free : str, optional
+        Text for free squares, by default "FREE"
+    cell : int, optional
+        Side length of a square, by default 40
+
+    Returns
+    -------
+    str
+        The exported SVG document.
+    """
+
+    import html
+
+    r = []
+    y = 0
+    max_w = 0
+
+    for card in cards:
+        h, w = card.height, card.width
+        max_w = max(max_w, w)
+        r.append(f'<g transform="translate(0,{y})">\n')
+        for square, (t, f) in enumerate(_cells(card, free)):
+            cls = "free" if square in card.free else "filled" if f else "blank"
+            x0 = square // h * cell
+            y0 = square % h * cell
+            r.append(
+                f'<rect class="{cls}" x="{x0}" y="{y0}"'
+                f' width="{cell}" height="{cell}"/>'
+                f'<text x="{x0 + cell // 2}" y="{y0 + cell // 2}">'
+                f"{html.escape(t)}</text>\n"
+            )
+        r.append("</g>\n")
+        y += (h + 1) * cell
+
+    head = (
+        '<svg xmlns="http://www.w3.org/2000/svg"'
+        f' width="{max_w * cell}" height="{max(y - cell, 0)}">\n'
+        "<style>rect{stroke:black}.blank,.free{fill:white}.filled{fill:silver}"
+        "text{text-anchor:middle;dominant-baseline:central}</style>\n"
+    )
+    return head + "".join(r) + "</svg>\n"
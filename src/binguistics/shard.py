@@ -0,0 +1,317 @@
+import collections.abc
+import multiprocessing
+import multiprocessing.connection
+from multiprocessing import shared_memory
+from typing import cast
+
+from .card import GridCard, _label_index, _LineTable
+
+
+def _read(shm: shared_memory.SharedMemory, i: int, nbytes: int) -> int:
+    buf = cast(memoryview, shm.buf)
+    return int.from_bytes(buf[i * nbytes : (i + 1) * nbytes], "little")
+
+
+def _write(shm: shared_memory.SharedMemory, i: int, nbytes: int, state: int):
+    buf = cast(memoryview, shm.buf)
+    buf[i * nbytes : (i + 1) * nbytes] = state.to_bytes(nbytes, "little")
+
+
+def _worker(
+    conn: multiprocessing.connection.Connection,
+    shm_name: str,
+    lines: _LineTable,
+    k: int,
+    start: int,
+    label_masks: list[dict[object, int]],
+):
+    # Serve draws for one shard. `label_masks` holds `label_masks()` of
+    # the cards in the shard, the first of which is the `start`-th card.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    nbytes = (lines.n + 7) // 8
+    index = _label_index(label_masks, start)
+
+    shard = range(start, start + len(label_masks))
+    won = {i for i in shard if lines.missing(_read(shm, i, nbytes)).count(0) >= k}
+
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            try:
+                r = []
+                for label in msg:
+                    winners = []
+                    for i, mask in index.get(label, ()):
+                        state = _read(shm, i, nbytes)
+                        if state & mask == mask:
+                            continue
+                        state |= mask
+                        _write(shm, i, nbytes, state)
+                        if i not in won and lines.missing(state).count(0) >= k:
+                            won.add(i)
+                            winners.append(i)
+                    r.append(winners)
+            except Exception as e:
+                # Report the error instead of dying, so that the hall can
+                # still be used; the labels before the failing one are kept.
+                try:
+                    conn.send(e)
+                except Exception:
+                    conn.send(RuntimeError(repr(e)))
+                continue
+            conn.send(r)
+    finally:
+        shm.close()
+        conn.close()
+
+
+class ShardedHall:
+    """
+    This class represents a hall of cards partitioned across worker processes.
+
+    The states of all cards are kept in a shared memory block,
+    `(height*width + 7) // 8` bytes per card in little-endian order, so that
+    bit `k` of a state is the square with the ID of `k` as in `CardBase`.
+    Each worker fills the cards of its shard when a label is drawn and reports
+    the cards that have newly reached `is_bingo(k)`. Labels are looked up by
+    hash, so they must be hashable; otherwise the results match
+    `fill_by_label` and `is_bingo` of the cards in a single process.
+
+    A hall should be closed when it is no longer needed, for example by using
+    it as a context manager.
+    """
+
+    def __init__(
+        self,
+        cards: collections.abc.Sequence[GridCard],
+        processes: int | None = None,
+        k: int = 1,
+    ):
+        """
+        Parameters
+        ----------
+        cards : Sequence[GridCard]
+            Cards with the same shape and winning lines, such as `Card`s of
+            the same size; there must be at least one card.
+        processes : int, optional
+            Number of worker processes, by default None, which means
+            `os.cpu_count()`
+        k : int, optional
+            Number of fully filled lines to win, by default 1
+        """
+        if not cards:
+            raise ValueError("no cards")
+        lines = cards[0]._lines
+        if any(c._lines is not lines for c in cards):
+            raise ValueError("cards must have the same shape and lines")
+        if k < 0:
+            raise ValueError("negative value")
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        if processes < 1:
+            raise ValueError("processes must be positive")
+        processes = min(processes, len(cards))
+
+        self._lines = lines
+        self._len = len(cards)
+        self._nbytes = (lines.n + 7) // 8
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=self._len * self._nbytes
+        )
+        self._conns: list[multiprocessing.connection.Connection] = []
+        self._procs: list[multiprocessing.Process] = []
+        self._closed = False
+
+        for i, c in enumerate(cards):
+            _write(self._shm, i, self._nbytes, c.state)
+
+        try:
+            for p in range(processes):
+                lo = self._len * p // processes
+                hi = self._len * (p + 1) // processes
+                label_masks = [cards[i].label_masks() for i in range(lo, hi)]
+                parent, child = multiprocessing.Pipe()
+                proc = multiprocessing.Process(
+                    target=_worker,
+                    args=(child, self._shm.name, lines, k, lo, label_masks),
+                    daemon=True,
+                )
+                proc.start()
+                child.close()
+                self._conns.append(parent)
+                self._procs.append(proc)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> "ShardedHall":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def size(self) -> int:
+        """
+        The size of the cards, which must be square.
+
+        Returns
+        -------
+        int
+            The size of the cards.
+        """
+        if self._lines.height != self._lines.width:
+            raise ValueError("the cards are not square")
+        return self._lines.height
+
+    @property
+    def height(self) -> int:
+        """
+        Number of rows on the cards.
+
+        Returns
+        -------
+        int
+            Number of rows on the cards.
+        """
+        return self._lines.height
+
+    @property
+    def width(self) -> int:
+        """
+        Number of columns on the cards.
+
+        Returns
+        -------
+        int
+            Number of columns on the cards.
+        """
+        return self._lines.width
+
+    @property
+    def processes(self) -> int:
+        """
+        Number of worker processes.
+
+        Returns
+        -------
+        int
+            Number of worker processes.
+        """
+        return len(self._procs)
+
+    def state(self, i: int) -> int:
+        """
+        The current state of the `i`-th card.
+
+        Parameters
+        ----------
+        i : int
+            Index of the card in the sequence the hall was created with.
+
+        Returns
+        -------
+        int
+            The card's current state.
+        """
+        if not (0 <= i < self._len):
+            raise ValueError("out of range")
+        if self._closed:
+            raise ValueError("the hall is closed")
+        return _read(self._shm, i, self._nbytes)
+
+    def states(self) -> tuple[int, ...]:
+        """
+        The current states of all cards.
+
+        Returns
+        -------
+        tuple[int]
+            States of the cards, in the order the hall was created with.
+        """
+        if self._closed:
+            raise ValueError("the hall is closed")
+        return tuple(_read(self._shm, i, self._nbytes) for i in range(self._len))
+
+    def draw_many(
+        self, labels: collections.abc.Iterable[object]
+    ) -> tuple[tuple[int, ...], ...]:
+        """
+        Draw labels one after another and fill every card with them.
+        All labels are sent to the workers at once.
+
+        Parameters
+        ----------
+        labels : Iterable[object]
+            The drawn labels, in order.
+
+        Returns
+        -------
+        tuple[tuple[int]]
+            For each label, the indices of the cards that have newly won by it,
+            in increasing order.
+
+        Raises
+        ------
+        TypeError
+            If a label is not hashable; no label is drawn then.
+        """
+        labels = list(labels)
+        if self._closed:
+            raise ValueError("the hall is closed")
+        for label in labels:
+            hash(label)
+
+        for conn in self._conns:
+            conn.send(labels)
+        replies = [conn.recv() for conn in self._conns]
+        for reply in replies:
+            if isinstance(reply, BaseException):
+                raise reply
+        r: list[list[int]] = [[] for _ in labels]
+        for reply in replies:
+            for winners, shard_winners in zip(r, reply):
+                winners += shard_winners
+        return tuple(tuple(sorted(w)) for w in r)
+
+    def draw(self, label: object) -> tuple[int, ...]:
+        """
+        Draw a label and fill every card with it.
+
+        Parameters
+        ----------
+        label : object
+            The drawn label.
+
+        Returns
+        -------
+        tuple[int]
+            Indices of the cards that have newly won, in increasing order.
+        """
+        return self.draw_many([label])[0]
+
+    def close(self):
+        """
+        Stop the workers and release the shared memory.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            conn.close()
+        for proc in self._procs:
+            proc.join()
+        self._conns = []
+        self._procs = []
+        self._shm.close()
+        self._shm.unlink()
@@ -0,0 +1,345 @@
+import collections
+import collections.abc
+import concurrent.futures
+import itertools
+import typing
+
+from .card import CardBase, GridCardBase
+
+
+class Record(typing.NamedTuple):
+    """
+    The result of evaluating one card.
+    """
+
+    position: int
+    """Position of the card in the stream"""
+    state: int
+    """The card's state"""
+    bingo: bool
+    """`CardBase.is_bingo(k)`"""
+    ready: bool
+    """`CardBase.is_ready()`"""
+    last_pieces: tuple[int, ...]
+    """`CardBase.last_pieces_for_bingo()`"""
+
+
+def chunks(
+    iterable: collections.abc.Iterable[object], n: int
+) -> collections.abc.Iterator[list]:
+    """
+    Split an iterable into lists of `n` items, the last one possibly shorter.
+
+    Parameters
+    ----------
+    iterable : Iterable[object]
+        Items to split
+    n : int
+        Number of items in a list
+
+    Yields
+    ------
+    list
+        The next `n` items.
+    """
+    if n < 1:
+        raise ValueError("n must be positive")
+    it = iter(iterable)
+    while chunk := list(itertools.islice(it, n)):
+        yield chunk
+
+
+def _evaluate(
+    cards: collections.abc.Iterable[GridCardBase], start: int, k: int, everything: bool
+) -> list[Record]:
+    # Records of `cards`, numbered from `start`
+    r = []
+
+    for i, c in enumerate(cards, start):
+        bingo = c.is_bingo(k)
+        ready = c.is_ready()
+        if bingo or ready or everything:
+            pieces = c.last_pieces_for_bingo() if ready else ()
+            r.append(Record(i, c.state, bingo, ready, pieces))
+    return r
+
+
+def evaluate(
+    size: int,
+    states: collections.abc.Iterable[int],
+    start: int = 0,
+    k: int = 1,
+    everything: bool = False,
+) -> list[Record]:
+    """
+    Evaluate cards given by their states.
+
+    Parameters
+    ----------
+    size : int
+        Cards' size
+    states : Iterable[int]
+        States of the cards, including free squares
+    start : int, optional
+        Index of the first card, by default 0
+    k : int, optional
+        Number of fully filled lines for bingo, by default 1
+    everything : bool, optional
+        Whether to report all cards, by default False, which means only
+        the cards that are bingo or ready
+
+    Returns
+    -------
+    list[Record]
+        Records of the cards, in order.
+
+    See Also
+    --------
+    evaluate_cards : The same for card objects, including variant cards.
+    """
+    return _evaluate((CardBase(size, state) for state in states), start, k, everything)
+
+
+def evaluate_cards(
+    cards: collections.abc.Iterable[GridCardBase],
+    start: int = 0,
+    k: int = 1,
+    everything: bool = False,
+) -> list[Record]:
+    """
+    Evaluate cards, which may have different sizes or game types.
+
+    Parameters
+    ----------
+    cards : Iterable[GridCardBase]
+        The cards, such as `Card` or `VariantCard`
+    start : int, optional
+        Index of the first card, by default 0
+    k : int, optional
+        Number of fully filled lines for bingo, by default 1
+    everything : bool, optional
+        Whether to report all cards, by default False, which means only
+        the cards that are bingo or ready
+
+    Returns
+    -------
+    list[Record]
+        Records of the cards, in order.
+    """
+    return _evaluate(cards, start, k, everything)
+
+
+def _stream(
+    func: collections.abc.Callable[..., list[Record]],
+    head: tuple,
+    items: collections.abc.Iterable[object],
+    chunk_size: int,
+    k: int,
+    everything: bool,
+    executor: concurrent.futures.Executor | None,
+    prefetch: int,
+) -> collections.abc.Iterator[Record]:
+    # Evaluate `items` chunk by chunk with `func(*head, chunk, start, k,
+    # everything)`, which is picklable for process pools. The arguments are
+    # checked here rather than on the first `next()` of the generator.
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if prefetch < 1:
+        raise ValueError("prefetch must be positive")
+    return _stream_chunks(
+        func, head, items, chunk_size, k, everything, executor, prefetch
+    )
+
+
+def _stream_chunks(
+    func: collections.abc.Callable[..., list[Record]],
+    head: tuple,
+    items: collections.abc.Iterable[object],
+    chunk_size: int,
+    k: int,
+    everything: bool,
+    executor: concurrent.futures.Executor | None,
+    prefetch: int,
+) -> collections.abc.Iterator[Record]:
+    # The generator of `_stream`
+    start = 0
+
+    if executor is None:
+        for chunk in chunks(items, chunk_size):
+            yield from func(*head, chunk, start, k, everything)
+            start += len(chunk)
+        return
+
+    pending: collections.deque[concurrent.futures.Future] = collections.deque()
+
+    for chunk in chunks(items, chunk_size):
+        pending.append(executor.submit(func, *head, chunk, start, k, everything))
+        start += len(chunk)
+        if len(pending) >= prefetch:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def stream(
+    states: collections.abc.Iterable[int],
+    size: int,
+    chunk_size: int = 10000,
+    k: int = 1,
+    everything: bool = False,
+    executor: concurrent.futures.Executor | None = None,
+    prefetch: int = 4,
+) -> collections.abc.Iterator[Record]:
+    """
+    Evaluate a stream of card states chunk by chunk.
+
+    Only `chunk_size` states are held at a time, or `prefetch` chunks if
+    `executor` is given, so memory use does not grow with the stream.
+
+    Parameters
+    ----------
+    states : Iterable[int]
+        States of the cards, including free squares
+    size : int
+        Cards' size
+    chunk_size : int, optional
+        Number of cards in a chunk, by default 10000
+    k : int, optional
+        Number of fully filled lines for bingo, by default 1
+    everything : bool, optional
+        Whether to report all cards, by default False, which means only
+        the cards that are bingo or ready
+    executor : concurrent.futures.Executor, optional
+        Executor to evaluate chunks in parallel, by default None, which means
+        evaluating them in this thread
+    prefetch : int, optional
+        Number of chunks submitted to `executor` ahead, by default 4
+
+    Yields
+    ------
+    Record
+        Records of the cards, in order.
+
+    See Also
+    --------
+    stream_cards : The same for card objects, including variant cards.
+    """
+    return _stream(
+        evaluate, (size,), states, chunk_size, k, everything, executor, prefetch
+    )
+
+
+def stream_cards(
+    cards: collections.abc.Iterable[GridCardBase],
+    chunk_size: int = 10000,
+    k: int = 1,
+    everything: bool = False,
+    executor: concurrent.futures.Executor | None = None,
+    prefetch: int = 4,
+) -> collections.abc.Iterator[Record]:
+    """
+    Evaluate a stream of cards chunk by chunk, as `stream` does for states.
+
+    Parameters
+    ----------
+    cards : Iterable[GridCardBase]
+        The cards, such as `Card` or `VariantCard`; they must be picklable
+        if `executor` runs in other processes.
+    chunk_size : int, optional
+        Number of cards in a chunk, by default 10000
+    k : int, optional
+        Number of fully filled lines for bingo, by default 1
+    everything : bool, optional
+        Whether to report all cards, by default False, which means only
+        the cards that are bingo or ready
+    executor : concurrent.futures.Executor, optional
+        Executor to evaluate chunks in parallel, by default None, which means
+        evaluating them in this thread
+    prefetch : int, optional
+        Number of chunks submitted to `executor` ahead, by default 4
+
+    Yields
+    ------
+    Record
+        Records of the cards, in order.
+    """
+    return _stream(
+        evaluate_cards, (), cards, chunk_size, k, everything, executor, prefetch
+    )
+
+
+def write_states(
+    f: typing.BinaryIO, states: collections.abc.Iterable[int], size: int
+) -> int:
+    """
+    Write card states to a binary file, `(size**2 + 7) // 8` bytes per card
+    in little-endian order.
+
+    Parameters
+    ----------
+    f : BinaryIO
+        File to write to
+    states : Iterable[int]
+        States of the cards
+    size : int
+        Cards' size
+
+    Returns
+    -------
+    int
+        Number of states written.
+    """
+    return _write_packed(f, states, (size**2 + 7) // 8)
+
+
+def _write_packed(
+    f: typing.BinaryIO, states: collections.abc.Iterable[int], nbytes: int
+) -> int:
+    # Same as `write_states`, `nbytes` bytes per card
+    n = 0
+
+    for chunk in chunks(states, 4096):
+        f.write(b"".join(state.to_bytes(nbytes, "little") for state in chunk))
+        n += len(chunk)
+    return n
+
+
+def read_states(
+    f: typing.BinaryIO, size: int, chunk_size: int = 10000
+) -> collections.abc.Iterator[int]:
+    """
+    Read card states written by `write_states`, `chunk_size` cards at a time.
+
+    Parameters
+    ----------
+    f : BinaryIO
+        File to read from
+    size : int
+        Cards' size
+    chunk_size : int, optional
+        Number of cards read at a time, by default 10000
+
+    Yields
+    ------
+    int
+        States of the cards, in order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    return _read_packed(f, (size**2 + 7) // 8, chunk_size)
+
+
+def _read_packed(
+    f: typing.BinaryIO, nbytes: int, chunk_size: int = 10000
+) -> collections.abc.Iterator[int]:
+    # Same as `read_states`, `nbytes` bytes per card
+    rest = b""
+
+    while data := f.read(nbytes * chunk_size):
+        data = rest + data
+        end = len(data) - len(data) % nbytes
+        for i in range(0, end, nbytes):
+            yield int.from_bytes(data[i : i + nbytes], "little")
+        rest = data[end:]
+    if rest:
+        raise ValueError("truncated state")
@@ -0,0 +1,341 @@
+import collections.abc
+import enum
+
+from .card import (
+    FreeLayout,
+    GridCard,
+    GridCardBase,
+    LabelVocabulary,
+    _LineTable,
+    _LineTableFactory,
+)
+
+
+class Variant:
+    """
+    This class represents a game type: the geometry of its cards and the lines
+    that win on them.
+
+    A card of a variant has `height` rows and `width` columns. Square IDs are
+    arranged column by column as in `CardBase`; for example, on a card with
+    3 rows and 9 columns, the IDs are arranged as follows.
+
+        0 3 6  9 12 15 18 21 24
+        1 4 7 10 13 16 19 22 25
+        2 5 8 11 14 17 20 23 26
+
+    The winning lines are built from the following kinds:
+    * "column": every column
+    * "row": every row
+    * "diagonal": both diagonals, only on square cards
+    * "full": all squares on the card at once
+    """
+
+    _KINDS = ("column", "row", "diagonal", "full")
+
+    def __init__(
+        self,
+        name: str,
+        height: int,
+        width: int,
+        lines: collections.abc.Iterable[str] = ("column", "row", "diagonal"),
+    ):
+        """
+        Parameters
+        ----------
+        name : str
+            Variant's name, used in the name of its win mask enum
+        height : int
+            Number of rows on a card
+        width : int
+            Number of columns on a card
+        lines : Iterable[str], optional
+            Kinds of winning lines, by default ("column", "row", "diagonal")
+        """
+        if height < 2 or width < 2:
+            raise ValueError("height and width must be greater than or equal to 2")
+
+        tmp_lines = set()
+
+        for kind in lines:
+            if kind not in self._KINDS:
+                raise ValueError(f"unknown kind of line: {kind!r}")
+            if kind == "diagonal" and height != width:
+                raise ValueError("diagonals need a square card")
+            tmp_lines.add(kind)
+        if not tmp_lines:
+            raise ValueError("no winning lines")
+
+        self._name = name
+        self._height = height
+        self._width = width
+        self._lines = tuple(k for k in self._KINDS if k in tmp_lines)
+
+    def _key(self) -> tuple:
+        return (self._name, self._height, self._width, self._lines)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Variant):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return (
+            f"Variant({self._name!r}, {self._height}, {self._width}, {self._lines!r})"
+        )
+
+    @property
+    def name(self) -> str:
+        """
+        The variant's name.
+
+        Returns
+        -------
+        str
+            The variant's name.
+        """
+        return self._name
+
+    @property
+    def height(self) -> int:
+        """
+        Number of rows on a card.
+
+        Returns
+        -------
+        int
+            Number of rows on a card.
+        """
+        return self._height
+
+    @property
+    def width(self) -> int:
+        """
+        Number of columns on a card.
+
+        Returns
+        -------
+        int
+            Number of columns on a card.
+        """
+        return self._width
+
+    @property
+    def lines(self) -> tuple[str, ...]:
+        """
+        Kinds of winning lines.
+
+        Returns
+        -------
+        tuple[str]
+            Kinds of winning lines, in the order their members appear in
+            the win mask enum.
+        """
+        return self._lines
+
+
+BINGO_75 = Variant("75", 5, 5)
+"""75-ball bingo: 5x5 cards, any column, row or diagonal wins."""
+
+BINGO_90 = Variant("90", 3, 9, ("row",))
+"""
+90-ball bingo: 3x9 tickets; one line, two lines and full house are
+`is_bingo(1)`, `is_bingo(2)` and `is_bingo(3)` respectively. The blanks on
+a ticket are given as free squares.
+"""
+
+BINGO_30 = Variant("30", 3, 3, ("full",))
+"""30-ball speed bingo: 3x3 cards, only a full house wins."""
+
+
+class _WinMaskFactory:
+    # Each instance is a singleton.
+
+    _instances: dict[Variant, enum.EnumMeta] = dict()
+    # variant -> masks of the winning lines as plain integers
+    _tables: dict[Variant, _LineTable] = dict()
+    # variant -> members of its win mask enum, in the same order
+    _members: dict[Variant, tuple[enum.IntEnum, ...]] = dict()
+
+    @classmethod
+    def _masks(cls, variant: Variant) -> list[tuple[str, int]]:
+        h = variant.height
+        w = variant.width
+        col_0 = 2**h - 1
+        row_0 = sum(1 << i for i in range(0, h * w, h))
+
+        members: list[tuple[str, int]] = []
+
+        for kind in variant.lines:
+            if kind == "column":
+                members += [(f"COLUMN_{i}", col_0 << (h * i)) for i in range(w)]
+            elif kind == "row":
+                members += [(f"ROW_{i}", row_0 << i) for i in range(h)]
+            elif kind == "diagonal":
+                members += [
+                    ("DIAGONAL_1", sum(1 << i for i in range(0, h * w, h + 1))),
+                    (
+                        "DIAGONAL_2",
+                        sum(1 << i for i in range(h - 1, h * w - h + 1, h - 1)),
+                    ),
+                ]
+            else:
+                members.append(("FULL", 2 ** (h * w) - 1))
+
+        return members
+
+    @classmethod
+    def create(cls, variant: Variant) -> enum.EnumMeta:
+        members = cls._masks(variant)
+        WinMask_v = enum.IntEnum(f"WinMask_{variant.name}", members)  # type: ignore
+
+        return WinMask_v
+
+    @classmethod
+    def get(cls, variant: Variant) -> enum.EnumMeta:
+        if variant not in cls._instances:
+            cls._instances[variant] = cls.create(variant)
+        return cls._instances[variant]
+
+    @classmethod
+    def table(cls, variant: Variant) -> _LineTable:
+        try:
+            return cls._tables[variant]
+        except KeyError:
+            masks = tuple(mask for _, mask in cls._masks(variant))
+            r = cls._tables[variant] = _LineTableFactory.get(
+                variant.height, variant.width, masks
+            )
+            return r
+
+    @classmethod
+    def members(cls, variant: Variant) -> tuple[enum.IntEnum, ...]:
+        try:
+            return cls._members[variant]
+        except KeyError:
+            r = cls._members[variant] = tuple(cls.get(variant))  # type: ignore
+            return r
+
+
+def win_mask(variant: Variant) -> enum.EnumMeta:
+    """
+    Return an `IntEnum` containing all winning lines on a card of `variant`.
+    Each member can be evaluated as an integer and its set bits correspond
+    to the square IDs that make up a line.
+
+    Parameters
+    ----------
+    variant : Variant
+        Game type
+
+    Returns
+    -------
+    enum.EnumMeta
+        `WinMask_{name}`; `{name}` will be replaced by the variant's name.
+
+    See Also
+    --------
+    line_mask : The same masks for square cards with rows, columns and diagonals.
+    """
+    return _WinMaskFactory.get(variant)
+
+
+class VariantCardBase(GridCardBase):
+    """
+    This is the base class that represents a card of a particular game type.
+
+    It works like `CardBase`, except that a card has `height*width` squares
+    and wins are defined by `win_mask(variant)`, whose lines may have
+    different lengths. Therefore the line queries count missing squares
+    instead of filled ones.
+    """
+
+    def __init__(
+        self,
+        variant: Variant,
+        state: int = 0,
+        free: collections.abc.Iterable[int] | FreeLayout = (),
+    ):
+        """
+        Parameters
+        ----------
+        variant : Variant
+            Game type
+        state : int, optional
+            Initial state, by default 0
+        free : Iterable[int] or FreeLayout, optional
+            IDs of free squares, by default ()
+        """
+        self._variant = variant
+        self._setup(_WinMaskFactory.table(variant), state, free)
+
+    @property
+    def variant(self) -> Variant:
+        """
+        The card's game type.
+
+        Returns
+        -------
+        Variant
+            The card's game type.
+        """
+        return self._variant
+
+    def analyze_missing(self, k: int) -> tuple[enum.IntEnum, ...]:
+        """
+        Find out lines each of which is missing `k` squares.
+
+        Parameters
+        ----------
+        k : int
+            Number of unfilled squares in a line.
+
+        Returns
+        -------
+        tuple
+            A tuple of `WinMask_{name}` members corresponding to the lines
+            with `k` unfilled squares.
+        """
+        missing = self._lines.missing(self._state)
+        members = _WinMaskFactory.members(self._variant)
+        return tuple(mask for mask, m in zip(members, missing) if m == k)
+
+
+class VariantCard(GridCard, VariantCardBase):
+    """
+    This class represents a concrete card of a particular game type.
+    Each non-free square has its own label, as on `Card`.
+    """
+
+    def __init__(
+        self,
+        variant: Variant,
+        labels: collections.abc.Iterable[object],
+        state: int = 0,
+        free: collections.abc.Iterable[int] | FreeLayout = (),
+        vocabulary: LabelVocabulary | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        variant : Variant
+            Game type
+        labels : Iterable[object]
+            Labels of non-free squares, in order of increasing ID.
+        state : int, optional
+            Initial state, by default 0
+        free : Iterable[int] or FreeLayout, optional
+            IDs of free squares, by default ()
+        vocabulary : LabelVocabulary, optional
+            Vocabulary to intern the labels into, by default None
+
+        See Also
+        --------
+        Card : Defining the meaning of `labels` and `vocabulary`.
+        """
+
+        super().__init__(variant, state=state, free=free)
+        self._setup_labels(labels, vocabulary)
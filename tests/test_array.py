@@ -0,0 +1,156 @@
+import binguistics.card as card
+import binguistics.variant as variant
+import pytest
+
+np = pytest.importorskip("numpy")
+array = pytest.importorskip("binguistics.array")
+
+
+def test_pack_states_1():
+    states = (0, 0b1_0000_0000, 0b111_010_001, 2**9 - 1)
+    packed = array.pack_states(states, 3)
+    assert packed.dtype == np.uint8
+    assert packed.shape == (4, 2)
+    assert packed[1].tolist() == [0, 1]
+    assert packed[2].tolist() == [0b1101_0001, 1]
+    assert array.unpack_states(packed) == states
+
+
+def test_pack_cards_1():
+    cards = [card.CardBase(4, s, (5,)) for s in (0, 0b1110_0101_1100_0000)]
+    packed = array.pack_cards(cards)
+    assert array.unpack_states(packed) == tuple(c.state for c in cards)
+
+
+def test_pack_cards_2():
+    cards = [variant.VariantCardBase(variant.BINGO_90, s) for s in (1 << 26, 5)]
+    packed = array.pack_cards(cards)
+    assert packed.shape == (2, 4)
+    assert array.unpack_states(packed) == (1 << 26, 5)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_pack_states_101():
+    array.pack_states([2**9], 3)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_pack_states_102():
+    array.pack_states([-1], 3)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_pack_cards_101():
+    array.pack_cards([card.CardBase(3), card.CardBase(4)])
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_pack_cards_102():
+    array.pack_cards([])
+
+
+def test_to_grid_1():
+    s = 0b000_010_011
+    grid = array.to_grid(array.pack_states([s], 3), 3)
+    assert grid.shape == (1, 3, 3)
+    assert grid.dtype == bool
+    # same as CardBase.show: "100\n110\n000\n"
+    assert grid[0].astype(int).tolist() == [[1, 0, 0], [1, 1, 0], [0, 0, 0]]
+
+
+def test_reports_1():
+    states = (0b011_000_000, 0b001_000_011, 0b111_000_111, 0b010_001_100, 0)
+    cards = [card.CardBase(3, s, (4,)) for s in states]
+    grid = array.to_grid(array.pack_cards(cards), 3)
+
+    freq = array.square_frequency(grid)
+    for row in range(3):
+        for col in range(3):
+            sq = col * 3 + row
+            assert freq[row, col] == sum(bool(c.state >> sq & 1) for c in cards)
+
+    counts = array.line_counts(grid)
+    for i, c in enumerate(cards):
+        assert counts[i].tolist() == [
+            (c.state & m).bit_count() for m in card.line_mask_values(3)
+        ]
+
+    assert array.line_completion_counts(grid).tolist() == [
+        sum(c.state & m == m for c in cards) for m in card.line_mask_values(3)
+    ]
+    ready = array.ready_counts(grid)
+    assert ready.tolist() == [len(c.analyze_lines(2)) for c in cards]
+    assert (ready > 0).tolist() == [c.is_ready() for c in cards]
+
+
+def simulate(c, order):
+    # completion time of each line by filling the card call by call
+    labels = [c.label(i) for i in range(c.size**2) if i not in c.free]
+    c = card.Card(c.size, labels, c.state, c.free)
+    r = [None] * len(card.line_mask_values(c.size))
+    for t in range(len(order) + 1):
+        if t:
+            c.fill_by_label(order[t - 1])
+        for j, mask in enumerate(card.line_mask_values(c.size)):
+            if r[j] is None and c.state & mask == mask:
+                r[j] = t
+    return [len(order) + 1 if x is None else x for x in r]
+
+
+def test_completion_times_1():
+    c = card.Card(3, (5, 1, 7, 3, 9, 2, 8, 4), 0b000_000_001, (4,))
+    calls = array.random_calls(range(1, 11), 50, seed=0)
+    assert calls.shape == (50, 10)
+    assert (np.sort(calls, axis=1) == np.arange(1, 11)).all()
+
+    times = array.completion_times(c, calls)
+    assert times.shape == (50, 8)
+    for k in range(50):
+        assert times[k].tolist() == simulate(c, calls[k].tolist())
+
+    # only the first 4 calls
+    times = array.completion_times(c, calls[:, :4])
+    for k in range(50):
+        assert times[k].tolist() == simulate(c, calls[k, :4].tolist())
+
+
+def test_completion_times_2():
+    v = card.LabelVocabulary()
+    c = card.Card(2, ("a", "b", "c", "d"), vocabulary=v)
+    calls = [[v.lookup(x) for x in "dcba"], [v.lookup(x) for x in "abcd"]]
+    times = array.completion_times(c, calls)
+    # COLUMN_0, COLUMN_1, ROW_0, ROW_1, DIAGONAL_1, DIAGONAL_2
+    assert times.tolist() == [[4, 2, 4, 3, 4, 3], [2, 4, 3, 4, 4, 3]]
+
+    assert array.bingo_times(times).tolist() == [2, 2]
+    assert array.first_line_counts(times).tolist() == [1, 1, 0, 0, 0, 0]
+    cdf = array.completion_cdf(times, 4)
+    assert cdf.shape == (6, 5)
+    assert cdf[0].tolist() == [0, 0, 0.5, 0.5, 1]
+    assert cdf[2].tolist() == [0, 0, 0, 0.5, 1]
+
+
+def test_completion_times_3():
+    # lines of different lengths: ROW_0, ROW_1, FULL
+    v = variant.Variant("2x3", 2, 3, ("row", "full"))
+    c = variant.VariantCard(v, (1, 2, 3, 4, 5), free=(0,))
+    times = array.completion_times(c, [[2, 4, 1, 3, 5], [1, 3, 5, 2, 4]])
+    assert times.tolist() == [[2, 5, 5], [5, 3, 5]]
+    assert array.first_line_counts(times).tolist() == [1, 1, 0]
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_completion_cdf_101():
+    c = card.Card(3, (5, 1, 7, 3, 9, 2, 8, 4), free=(4,))
+    calls = array.random_calls(range(1, 10), 5, seed=0)
+    array.completion_cdf(array.completion_times(c, calls[:, :3]), 2)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_completion_times_101():
+    array.completion_times(card.Card(2, "abcd"), [[1, 2]])
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_completion_times_102():
+    array.completion_times(card.Card(2, range(4)), [1, 2])
@@ -0,0 +1,91 @@
+import asyncio
+
+import binguistics.autodaub as autodaub
+import binguistics.card as card
+import pytest
+
+
+def make_cards():
+    return [
+        card.Card(3, range(1, 10)),
+        card.Card(3, range(9, 0, -1)),
+        card.Card(3, (1, 2, 3, 1, 2, 3, 1, 2), free=(8,)),
+    ]
+
+
+def test_draw_1():
+    async def main():
+        cards = make_cards()
+        dauber = autodaub.AutoDauber(cards, window=0.01)
+        futures = [dauber.draw(label) for label in (1, 2, 4)]
+        batch = await futures[0]
+        assert all(f.result() is batch for f in futures)
+        assert batch == autodaub.DaubBatch((1, 2, 4), (2,), (0, 1, 2))
+
+        ref = make_cards()
+        for c in ref:
+            for label in (1, 2, 4):
+                c.fill_by_label(label)
+        assert [c.state for c in cards] == [c.state for c in ref]
+
+        m = dauber.metrics
+        assert (m.draws, m.batches, m.fills, m.updates) == (3, 1, 8, 3)
+        assert m.draws_per_batch == 3
+        assert m.saved == 1 - 3 / 8
+        assert 0 < m.mean_latency <= m.max_latency
+
+        batch = await dauber.draw(3)
+        assert batch.winners == (0, 1)
+        assert dauber.metrics.batches == 2
+
+    asyncio.run(main())
+
+
+def test_draw_2():
+    async def main():
+        cards = make_cards()
+        dauber = autodaub.AutoDauber(cards, window=10, max_batch=2, k=2)
+        f1 = dauber.draw(1)
+        f2 = dauber.draw(5)
+        assert f1.done() and f2.done()
+        f3 = dauber.draw(9)
+        assert not f3.done()
+        await dauber.close()
+        assert f3.result() == autodaub.DaubBatch((9,), (), ())
+        assert dauber.flush() is None
+        assert dauber.metrics.batches == 2
+        assert dauber.cards[0].state == 0b100_010_001
+
+    asyncio.run(main())
+
+
+def test_draw_3():
+    async def main():
+        dauber = autodaub.AutoDauber(make_cards(), window=0.01)
+        f = dauber.draw(1)
+        with pytest.raises(TypeError):
+            dauber.draw([5])
+        assert (await f).labels == (1,)
+
+        class Broken(dict):
+            def get(self, *args):
+                raise RuntimeError("broken")
+
+        dauber._index = Broken()
+        futures = [dauber.draw(label) for label in (1, 2)]
+        for f in futures:
+            with pytest.raises(RuntimeError):
+                await f
+        assert dauber.flush() is None
+
+    asyncio.run(main())
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_init_101():
+    autodaub.AutoDauber([], window=-1)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_init_102():
+    autodaub.AutoDauber([], max_batch=0)
@@ -182,3 +182,113 @@ def test_fill_by_label_4():
     assert c.state == 0b11_01
     c.fill_by_label(200)
     assert c.state == 0b11_11
+
+
+def test_eq_1():
+    a = card.Card(2, (1, 2, 3, 4), 0b0001)
+    b = card.Card(2, [1, 2, 3, 4])
+    assert a != b
+    b.fill_by_label(1)
+    assert a == b
+    assert hash(a) == hash(b)
+
+    c = card.Card(2, (1, 2, 3, 5), 0b0001)
+    assert a != c
+    assert hash(a) == hash(c)
+    assert a != card.CardBase(2, 0b0001)
+
+    d = card.Card(2, ([1], [2], [3], [4]))
+    assert d == card.Card(2, ([1], [2], [3], [4]))
+
+
+def test_vocabulary_1():
+    v = card.LabelVocabulary(["x", "y"])
+    assert len(v) == 2
+    assert v.intern("y") == 1
+    assert v.intern(("z", 1)) == 2
+    assert v.lookup("w") is None
+    assert "w" not in v
+    assert ("z", 1) in v
+    assert v.label(2) == ("z", 1)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_vocabulary_101():
+    card.LabelVocabulary(["x"]).label(1)
+
+
+def test_init_4():
+    v = card.LabelVocabulary()
+    ll = [f"B{i}" for i in range(13)]
+    s = 0b1110_0101_1100_0000
+    f = (5, 2, 4)
+    c = card.Card(4, ll, s, f, vocabulary=v)
+    assert c.vocabulary is v
+    assert len(v) == 13
+    assert c.state == 0b1110_0101_1111_0100
+    assert [c.label(i) for i in range(16)] == ["B0", "B1", None, "B2", None, None] + [
+        f"B{i}" for i in range(3, 13)
+    ]
+    assert c == card.Card(4, ll, s, f)
+    assert card.Card(4, ll, s, f).vocabulary is None
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_init_106():
+    card.Card(2, ("a", "b", "c"), vocabulary=card.LabelVocabulary())
+
+
+def test_fill_by_label_5():
+    v = card.LabelVocabulary()
+    c = card.Card(2, ("100", "200", "100", "100"), vocabulary=v)
+    d = card.Card(2, ("300", "100", "400", "500"), vocabulary=v)
+    c.fill_by_label("300")
+    assert c.state == 0b00_00
+    c.fill_by_label("999")
+    assert c.state == 0b00_00
+    assert "999" not in v
+    c.fill_by_label("100")
+    assert c.state == 0b11_01
+    c.fill_by_id(v.lookup("200"))
+    assert c.state == 0b11_11
+    d.fill_by_id(v.lookup("100"))
+    assert d.state == 0b00_10
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_fill_by_id_101():
+    card.Card(2, (1, 2, 3, 4)).fill_by_id(0)
+
+
+def test_init_5():
+    # `free` may be a generator.
+    c = card.Card(3, range(8), free=(i for i in (4,)))
+    assert c.free == (4,)
+    assert c.label(4) is None
+    assert c.label(5) == 4
+
+    layout = card.free_layout(3, (4,))
+    d = card.Card(3, range(8), free=layout)
+    assert d == c
+    assert d.layout is layout
+    e = card.Card(3, range(8), free=layout, vocabulary=card.LabelVocabulary())
+    assert e._table() == d._table()
+
+
+def test_label_masks_1():
+    labels = ("a", "b", "a", "c", "a", "d", "e", "b")
+    c = card.Card(3, labels, free=(4,))
+    assert c.label_masks() == {
+        "a": 0b000_000_101 | 1 << 5,
+        "b": 0b000_000_010 | 1 << 8,
+        "c": 1 << 3,
+        "d": 1 << 6,
+        "e": 1 << 7,
+    }
+    d = card.Card(3, labels, free=(4,), vocabulary=card.LabelVocabulary())
+    assert d.label_masks() == c.label_masks()
+
+    for label, mask in c.label_masks().items():
+        e = card.Card(3, labels, free=(4,))
+        e.fill_by_label(label)
+        assert e.state == mask | 1 << 4
@@ -1,4 +1,8 @@
 # pylint: disable=redefined-outer-name, unused-argument
+import random
+import sys
+import threading
+
 import binguistics.card as card
 import pytest
 
@@ -24,6 +28,24 @@ def test_line_mask_2():
     assert len(mask2) == 6
 
 
+def test_line_mask_values_1():
+    for size in range(2, 13):
+        assert card.line_mask_values(size) == tuple(card.line_mask(size))
+
+
+def test_line_mask_values_2():
+    c = card.CardBase(13, 2**13 - 1)
+    assert c.is_bingo()
+    assert not c.is_ready()
+    assert c.last_pieces_for_bingo() == ()
+    assert 13 not in card._LineMaskFactory._instances
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_line_mask_values_101():
+    card.line_mask_values(1)
+
+
 @pytest.mark.xfail(raises=ValueError)
 def test_line_mask_101():
     card.line_mask(-3)
@@ -395,3 +417,153 @@ def test_show_1(capsys):
     c.show(blank="0", filled="1", free="F")
     out, _ = capsys.readouterr()
     assert out == "100\n110\nF00\n"
+
+
+def test_eq_1():
+    a = card.CardBase(3, 0b001, (4,))
+    b = card.CardBase(3, 0b001_0000 | 0b001, [4, 4])
+    assert a == b
+    assert hash(a) == hash(b)
+    assert len({a, b}) == 1
+
+    assert a != card.CardBase(3, 0b001)
+    assert a != card.CardBase(3, 0b001 | 0b001_0000)
+    assert a != card.CardBase(4, 0b001, (4,))
+    assert a != card.Card(3, range(8), 0b001, (4,))
+    assert a != (3, 0b1_0001, (4,))
+
+    b.fill(8)
+    assert a != b
+
+
+def test_line_analysis_cache_1():
+    cache = card.LineAnalysisCache(2)
+    assert cache.get(3, 0b000_010_001) == (1, 1, 0, 1, 1, 0, 2, 1)
+    assert cache.get(3, 0b000_010_001) == (1, 1, 0, 1, 1, 0, 2, 1)
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+    assert cache.hit_rate == 0.5
+
+    cache.get(3, 0)
+    cache.get(3, 0b000_010_001)
+    cache.get(4, 0)
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 3, 1)
+    assert cache.currsize == 2
+    cache.get(3, 0b000_010_001)
+    assert cache.hits == 3
+
+    cache.resize(1)
+    assert cache.currsize == 1
+    assert cache.evictions == 2
+    cache.get(3, 0b000_010_001)
+    assert cache.hits == 4
+
+    cache.resize(0)
+    cache.get(3, 0)
+    assert cache.currsize == 0
+
+    cache.clear()
+    assert (cache.hits, cache.misses, cache.evictions) == (0, 0, 0)
+    assert cache.hit_rate == 0.0
+
+
+def test_line_analysis_cache_2():
+    card.line_analysis_cache.clear()
+    cards = [card.CardBase(5, 0b11111_00000) for _ in range(10)]
+    assert all(c.is_bingo() for c in cards)
+    assert all(not c.is_ready() for c in cards)
+    assert card.line_analysis_cache.misses == 1
+    assert card.line_analysis_cache.hits == 19
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_line_analysis_cache_101():
+    card.LineAnalysisCache(-1)
+
+
+def test_free_layout_1():
+    layout = card.free_layout(3, (8, 0, 4, 0))
+    assert layout.n == 9
+    assert layout.mask == 0b100_010_001
+    assert layout.free == (0, 4, 8)
+    assert layout.squares == (1, 2, 3, 5, 6, 7)
+    assert card.free_layout(3, (8, 0, 4, 0)) is layout
+    assert card.free_layout(3, iter((0, 4, 8))) == layout
+    assert card.free_layout(4, (0, 4, 8)) != layout
+
+
+def test_free_layout_2():
+    layout = card.free_layout(5, (12,))
+    c = card.CardBase(5, 0b1, layout)
+    assert c.layout is layout
+    assert c.free == (12,)
+    assert c.state == 0b1 | 1 << 12
+    assert c == card.CardBase(5, 0b1, (12,))
+    assert card.CardBase(5, free=c.layout).layout is layout
+
+
+def test_free_layout_3():
+    # Cached by the set of free squares, and only the recent ones are kept
+    assert card.CardBase(3, 0, (1, 2)).layout is card.CardBase(3, 0, (2, 1)).layout
+    assert card.free_layout(3, (2, 1, 2)) is card.CardBase(3, 0, (1, 2)).layout
+    assert card.free_layout(3) is card.CardBase(3).layout
+
+    n = card._FreeLayoutFactory.maxsize
+    layout = card.free_layout(30, (0,))
+    for i in range(1, 2 * n):
+        card.free_layout(30, (i,))
+        assert card.free_layout(30, (0,)) is layout
+    assert len(card._FreeLayoutFactory._instances) == n
+    for i in range(1, n + 1):
+        card.free_layout(30, (i,))
+    assert card.free_layout(30, (0,)) is not layout
+    assert card.free_layout(30, (0,)) == layout
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_free_layout_101():
+    card.free_layout(3, (9,))
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_free_layout_102():
+    card.CardBase(4, free=card.free_layout(3, (0,)))
+
+
+def test_line_analysis_cache_3():
+    # Lookups from several threads at once, most of which evict an analysis
+    cache = card.LineAnalysisCache(16)
+    values = card.line_mask_values(5)
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def work(seed):
+        rng = random.Random(seed)
+        states = [
+            rng.getrandbits(25) if rng.random() < 0.9 else rng.randrange(4)
+            for _ in range(30000)
+        ]
+        barrier.wait()
+        for state in states:
+            try:
+                analysis = cache.get(5, state)
+            except Exception as e:
+                errors.append(e)
+                continue
+            if analysis != tuple((state & mask).bit_count() for mask in values):
+                errors.append(state)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert not errors
+    assert cache.hits + cache.misses == 240000
+    assert cache.evictions > 0
+    assert cache.currsize == 16
@@ -0,0 +1,176 @@
+import random
+
+import binguistics.card as card
+import binguistics.differential as differential
+import binguistics.stream as stream
+import binguistics.variant as variant
+import pytest
+
+
+def base_card(c):
+    return card.CardBase(c.size, c.state, c.free)
+
+
+def variant_card(c):
+    v = variant.Variant(f"square{c.size}", c.size, c.size)
+    return variant.VariantCardBase(v, c.state, c.free)
+
+
+def vocabulary_card(c):
+    return card.Card(
+        c.size, c.labels, c.state, c.free, vocabulary=card.LabelVocabulary()
+    )
+
+
+def fill_by_id(c):
+    x = vocabulary_card(c)
+    label_id = x.vocabulary.lookup(c.label)
+    if label_id is not None:
+        x.fill_by_id(label_id)
+    return x.state
+
+
+def stream_record(c):
+    state = card.CardBase(c.size, c.state, c.free).state
+    return stream.evaluate(c.size, (state,), everything=True)[0]
+
+
+def test_random_case_1():
+    rng = random.Random(0)
+    for _ in range(200):
+        c = differential.random_case(rng, 4)
+        assert 2 <= c.size <= 4
+        assert c.state < 1 << c.size**2
+        assert all(0 <= x < c.size**2 for x in c.free)
+        assert len(c.labels) == c.size**2 - len(set(c.free))
+
+
+def test_harness_1():
+    h = differential.Harness(seed=0)
+    h.register("is_bingo", "variant", lambda c: variant_card(c).is_bingo(c.k))
+    h.register("is_ready", "variant", lambda c: variant_card(c).is_ready())
+    h.register(
+        "last_pieces_for_bingo",
+        "variant",
+        lambda c: variant_card(c).last_pieces_for_bingo(),
+    )
+    h.register("blank", "variant", lambda c: variant_card(c).blank)
+    h.register("filled", "variant", lambda c: variant_card(c).filled)
+    h.register("fill_by_label", "vocabulary", lambda c: fill_by_id(c))
+    h.register(
+        "analyze_lines",
+        "line values",
+        lambda c: card.CardBase(c.size, c.state, c.free)._analyze_line_values(c.k),
+    )
+    h.register("is_ready", "stream", lambda c: stream_record(c).ready)
+    h.register(
+        "last_pieces_for_bingo",
+        "stream",
+        lambda c: stream_record(c).last_pieces if stream_record(c).ready else (),
+    )
+
+    results = h.run(500)
+    assert [(x.operation, x.name) for x in results] == [
+        ("is_bingo", "variant"),
+        ("is_ready", "variant"),
+        ("last_pieces_for_bingo", "variant"),
+        ("blank", "variant"),
+        ("filled", "variant"),
+        ("fill_by_label", "vocabulary"),
+        ("analyze_lines", "line values"),
+        ("is_ready", "stream"),
+        ("last_pieces_for_bingo", "stream"),
+    ]
+    for x in results:
+        assert x.ok, x.mismatches[0]
+        assert x.cases == 500
+        assert x.speedup > 0
+    assert differential.report(results).count("\n") == len(results)
+
+
+def test_harness_2():
+    # A wrong implementation is caught and its cases are kept.
+    h = differential.Harness(seed=1, max_size=5)
+    h.register("filled", "ignores free", lambda c: tuple(card._find_ones(c.state)))
+    h.register("is_bingo", "no check", lambda c: c.k <= 0)
+    r = h.run(300, max_mismatches=3)
+    assert not r[0].ok
+    assert len(r[0].mismatches) == 3
+    case, expected, actual = r[0].mismatches[0]
+    assert set(case.free) & set(actual)
+    assert not set(case.free) & set(expected)
+
+    # Negative k raises ValueError in the reference but not here.
+    assert not r[1].ok
+    assert any(e is ValueError for _, e, _ in r[1].mismatches)
+    assert "MISMATCH" in differential.report(r)
+
+
+def test_harness_3():
+    # The same seed produces the same cases.
+    cases = []
+    for _ in range(2):
+        h = differential.Harness(seed=2)
+        seen = []
+        h.register("is_ready", "spy", lambda c: seen.append(c) or False)
+        h.run(50)
+        cases.append(seen)
+    assert cases[0] == cases[1]
+
+
+def test_harness_4():
+    # The real operations with the cache against the reference without it;
+    # every pass has a private cache, and the shared one is left as it is.
+    caches = []
+
+    def spy(c):
+        caches.append(card._active_cache)
+        return card.CardBase(c.size, c.state, c.free).is_bingo(c.k)
+
+    shared = card.line_analysis_cache
+    card.CardBase(3, 0b111).is_bingo()
+    card.CardBase(3, 0b111).is_bingo()
+    stats = (shared.currsize, shared.hits, shared.misses)
+
+    h = differential.Harness(seed=3)
+    h.register("is_bingo", "spy", spy)
+    h.register("is_bingo", "spy again", spy)
+    h.register(
+        "analyze_lines",
+        "CardBase",
+        lambda c: tuple(int(m) for m in base_card(c).analyze_lines(c.k)),
+    )
+    h.register("is_ready", "CardBase", lambda c: base_card(c).is_ready())
+    h.register(
+        "last_pieces_for_bingo",
+        "CardBase",
+        lambda c: base_card(c).last_pieces_for_bingo(),
+    )
+    h.register("blank", "CardBase", lambda c: base_card(c).blank)
+    h.register("filled", "CardBase", lambda c: base_card(c).filled)
+
+    def fill_by_label(c):
+        x = card.Card(c.size, c.labels, c.state, c.free)
+        x.fill_by_label(c.label)
+        return x.state
+
+    h.register("fill_by_label", "Card", fill_by_label)
+
+    results = h.run(200)
+    for x in results:
+        assert x.ok, (x.operation, x.mismatches[0])
+    assert caches[0] is not shared and caches[0] is not caches[200]
+    assert caches[0].maxsize == shared.maxsize
+    assert caches[0].misses > 0
+    assert card._active_cache is shared
+    assert (shared.currsize, shared.hits, shared.misses) == stats
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_harness_101():
+    differential.Harness().register("no such operation", "x", lambda c: None)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_harness_102():
+    differential.Harness(max_size=1)
@@ -0,0 +1,150 @@
+import os
+
+import binguistics.card as card
+import binguistics.journal as journal
+import binguistics.variant as variant
+import pytest
+
+
+def make_hall(tmp_path, **kwargs):
+    hall = journal.JournaledHall(tmp_path, **kwargs)
+    hall.register("a", card.Card(3, range(1, 10)))
+    hall.register("b", card.Card(3, range(9, 1, -1), free=(4,)))
+    hall.register(("c", 1), variant.VariantCard(variant.BINGO_30, range(11, 20)))
+    return hall
+
+
+def test_recover_1(tmp_path):
+    hall = make_hall(tmp_path, snapshot_every=3)
+    for label in (1, 5, 9, 11, 4, 15, 7):
+        hall.draw(label)
+    # crash without closing
+    hall._journal.flush()
+
+    r = journal.JournaledHall.recover(tmp_path)
+    assert r.draws == (1, 5, 9, 11, 4, 15, 7)
+    assert list(r.cards) == ["a", "b", ("c", 1)]
+    for card_id, c in hall.cards.items():
+        assert r.cards[card_id].state == c.state
+    assert r.cards["a"].is_bingo()
+
+    r.draw(3)
+    assert r.cards["a"].state == hall.cards["a"].state | 1 << 2
+    r.close()
+    hall.close()
+
+
+def test_recover_2(tmp_path, monkeypatch):
+    hall = make_hall(tmp_path, snapshot_every=4)
+    for label in range(1, 11):
+        hall.draw(label)
+    hall.close()
+
+    applied = []
+    apply = journal.JournaledHall._apply
+
+    def counting_apply(self, record):
+        applied.append(record)
+        apply(self, record)
+
+    monkeypatch.setattr(journal.JournaledHall, "_apply", counting_apply)
+    with journal.JournaledHall.recover(tmp_path) as r:
+        # snapshot after 8 draws; only the last 2 are replayed
+        assert applied == [("draw", 9), ("draw", 10)]
+        assert r.draws == tuple(range(1, 11))
+
+
+def test_recover_3(tmp_path):
+    # a record cut off by a crash is discarded
+    hall = make_hall(tmp_path, snapshot_every=0)
+    hall.draw(1)
+    hall.draw(2)
+    hall.close()
+    path = os.path.join(tmp_path, journal.JournaledHall.JOURNAL)
+    size = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(b"\x40\x00\x00\x00\x80")
+
+    with journal.JournaledHall.recover(tmp_path) as r:
+        assert r.draws == (1, 2)
+        assert os.path.getsize(path) == size
+        r.draw(3)
+    with journal.JournaledHall.recover(tmp_path) as r:
+        assert r.draws == (1, 2, 3)
+        assert r.cards["a"].state == 0b111
+
+
+def test_recover_4(tmp_path):
+    # Cards sharing a vocabulary share it after recovery, and a snapshot
+    # holds only the packed states.
+    v = card.LabelVocabulary()
+    hall = journal.JournaledHall(tmp_path, snapshot_every=2)
+    hall.register("a", card.Card(3, "abcdefghi", vocabulary=v))
+    hall.register("b", card.Card(3, "ihgfedcbx", vocabulary=v))
+    hall.register("c", card.Card(4, range(16)))
+    hall.register(
+        "d", variant.VariantCard(variant.BINGO_90, "abcdefghi" * 3, vocabulary=v)
+    )
+    for label in "abcx":
+        hall.draw(label)
+    hall.register("e", card.Card(2, "yzab", vocabulary=v))
+    hall.draw("z")
+    hall._journal.flush()
+
+    path = os.path.join(tmp_path, journal.JournaledHall.SNAPSHOT)
+    assert os.path.getsize(path) == journal._SNAPSHOT.size + 4 * 4
+
+    r = journal.JournaledHall.recover(tmp_path)
+    assert r.draws == tuple("abcxz")
+    for card_id, c in hall.cards.items():
+        assert r.cards[card_id] == c
+    vocabularies = {id(c.vocabulary) for k, c in r.cards.items() if k != "c"}
+    assert len(vocabularies) == 1
+    assert r.cards["a"].vocabulary._labels == v._labels
+
+    r.draw("y")
+    r.draw("i")
+    assert r.cards["e"].state == 0b0011
+    assert r.cards["a"].state == 0b1_0000_0111
+    assert r.cards["b"].state == 0b1_1100_0001
+    r.close()
+    hall.close()
+
+
+def test_register_1(tmp_path, monkeypatch):
+    # A vocabulary is journaled once, with only the labels new since then.
+    records = []
+    append = journal.JournaledHall._append
+
+    def spy(self, record):
+        records.append(record)
+        append(self, record)
+
+    monkeypatch.setattr(journal.JournaledHall, "_append", spy)
+    v = card.LabelVocabulary()
+    with journal.JournaledHall(tmp_path) as hall:
+        hall.register(1, card.Card(2, "abcd", vocabulary=v))
+        hall.register(2, card.Card(2, "dcba", vocabulary=v))
+        hall.register(3, card.Card(2, "abce", vocabulary=v))
+    assert [r[0] for r in records] == ["labels", "card", "card", "labels", "card"]
+    assert records[0] == ("labels", 0, tuple("abcd"))
+    assert records[3] == ("labels", 0, ("e",))
+
+
+def test_init_1(tmp_path):
+    make_hall(tmp_path).close()
+    with journal.JournaledHall(tmp_path) as hall:
+        assert not hall.cards
+    with journal.JournaledHall.recover(tmp_path) as hall:
+        assert not hall.cards
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_register_101(tmp_path):
+    with make_hall(tmp_path) as hall:
+        hall.register("a", card.Card(2, range(4)))
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_init_101(tmp_path):
+    journal.JournaledHall(tmp_path, snapshot_every=-1)
@@ -0,0 +1,149 @@
+import random
+
+import binguistics.card as card
+import binguistics.prize as prize
+import binguistics.variant as variant
+import pytest
+
+
+def naive(cards, calls, prizes=prize.LADDER):
+    # Check the open prize on every card after every draw.
+    n = 0
+    r = []
+    for label in calls:
+        for c in cards:
+            c.fill_by_label(label)
+        awards = []
+        while n < len(prizes):
+            lines = prizes[n].lines
+            winners = tuple(
+                i
+                for i, c in enumerate(cards)
+                if (c.is_bingo(lines) if lines else not c.blank)
+            )
+            if not winners:
+                break
+            awards.append(prize.Award(prizes[n], winners))
+            n += 1
+        r.append(prize.DrawResult(label, tuple(awards)))
+    return r
+
+
+def test_draw_1():
+    cards = [card.Card(3, range(1, 10)), card.Card(3, range(9, 0, -1))]
+    ladder = prize.PrizeLadder(cards)
+    assert ladder.open_prize == prize.ONE_LINE
+    assert ladder.draw(1).awards == ()
+    assert ladder.draw(2).awards == ()
+
+    # Ties share the prize.
+    r = ladder.draw(3)
+    assert r == prize.DrawResult(3, (prize.Award(prize.ONE_LINE, (0, 1)),))
+    assert r.awards[0].share == 0.5
+    assert ladder.tiers == (1, 1)
+    assert ladder.open_prize == prize.TWO_LINES
+
+    for label in (4, 5):
+        assert ladder.draw(label).awards == ()
+    r = ladder.draw(6)
+    assert r.awards == (prize.Award(prize.TWO_LINES, (0, 1)),)
+
+    for label in (7, 8):
+        assert ladder.draw(label).awards == ()
+    r = ladder.draw(9)
+    assert r.awards == (prize.Award(prize.FULL_HOUSE, (0, 1)),)
+    assert ladder.tiers == (3, 3)
+    assert ladder.open_prize is None
+    assert len(ladder.awards) == 3
+    assert ladder.draw(10).awards == ()
+
+
+def test_draw_2():
+    # One draw can settle several prizes.
+    ladder = prize.PrizeLadder([card.Card(3, range(1, 10))])
+    for label in (2, 3, 4, 7):
+        assert ladder.draw(label).awards == ()
+    r = ladder.draw(1)
+    assert [a.prize for a in r.awards] == [prize.ONE_LINE, prize.TWO_LINES]
+    assert ladder.tiers == (2,)
+
+
+def test_draw_3():
+    # Cards at a tier before any draw win on the first one.
+    cards = [
+        card.Card(3, (1, 2, 3, 4, 5, 6), state=0b111, free=(0, 1, 2)),
+        card.Card(3, range(1, 10)),
+    ]
+    ladder = prize.PrizeLadder(cards)
+    assert ladder.tiers == (1, 0)
+    r = ladder.draw(100)
+    assert r.awards == (prize.Award(prize.ONE_LINE, (0,)),)
+
+
+def test_draw_4():
+    rng = random.Random(0)
+    ladders = (
+        prize.LADDER,
+        (prize.ONE_LINE, prize.FULL_HOUSE),
+        (prize.Prize("three lines", 3),),
+    )
+    for prizes in ladders:
+        for _ in range(20):
+            size = rng.choice((3, 4, 5))
+            labels = range(size**2 + 5)
+            layouts = [rng.sample(labels, size**2) for _ in range(30)]
+            calls = rng.sample(labels, len(labels))
+
+            ref = naive([card.Card(size, x) for x in layouts], calls, prizes)
+            ladder = prize.PrizeLadder([card.Card(size, x) for x in layouts], prizes)
+            assert [ladder.draw(label) for label in calls] == ref
+            assert ladder.tiers == (len(prizes),) * len(layouts)
+
+
+def test_draw_5():
+    # 90-ball tickets: one line, two lines and full house are
+    # is_bingo(1), is_bingo(2) and is_bingo(3).
+    rng = random.Random(1)
+    for _ in range(10):
+        tickets = []
+        for _ in range(20):
+            blanks = [sq for row in range(3) for sq in rng.sample(range(row, 27, 3), 4)]
+            numbers = rng.sample(range(1, 91), 15)
+            tickets.append((numbers, blanks))
+        calls = rng.sample(range(1, 91), 90)
+
+        def make():
+            return [
+                variant.VariantCard(variant.BINGO_90, x, free=f) for x, f in tickets
+            ]
+
+        cards = make()
+        ref = naive(make(), calls)
+        ladder = prize.PrizeLadder(cards)
+        r = []
+        for label in calls:
+            r.append(ladder.draw(label))
+            for i, t in enumerate(ladder.tiers):
+                assert t == sum(cards[i].is_bingo(k) for k in (1, 2, 3))
+        assert r == ref
+        assert ladder.open_prize is None
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_ladder_101():
+    prize.PrizeLadder([], ())
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_ladder_102():
+    prize.PrizeLadder([], (prize.FULL_HOUSE, prize.ONE_LINE))
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_ladder_103():
+    prize.PrizeLadder([], (prize.TWO_LINES, prize.ONE_LINE))
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_ladder_104():
+    prize.PrizeLadder([], (prize.Prize("none", 0),))
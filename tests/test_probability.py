@@ -0,0 +1,140 @@
+import itertools
+import os
+import random
+import subprocess
+import sys
+
+import binguistics.card as card
+import binguistics.probability as probability
+import binguistics.variant as variant
+import pytest
+
+
+def brute_force(c, remaining, m, masks=None):
+    masks = card.line_mask_values(c.size) if masks is None else masks
+    wins = 0
+    total = 0
+    for drawn in itertools.combinations(remaining, m):
+        d = card.Card(c.size, [c.label(i) for i in range(c.size**2)], c.state)
+        for label in drawn:
+            d.fill_by_label(label)
+        wins += any(d.state & mask == mask for mask in masks)
+        total += 1
+    return wins / total
+
+
+def test_exact_1():
+    c = card.Card(3, range(1, 10))
+    c.fill_by_label(1)
+    c.fill_by_label(5)
+    remaining = [2, 3, 4, 6, 7, 8, 9, 10, 11]
+    p = probability.WinProbability(remaining)
+    for m in range(len(remaining) + 1):
+        assert p.exact([c], m)[0] == pytest.approx(brute_force(c, remaining, m))
+
+
+def test_exact_2():
+    # duplicate labels and a line that cannot be completed
+    c = card.Card(3, (1, 2, 3, 1, 5, 6, 7, 8, 9))
+    remaining = [1, 2, 3, 5, 6, 8, 9]
+    p = probability.WinProbability(remaining)
+    for m in range(len(remaining) + 1):
+        assert p.exact([c], m)[0] == pytest.approx(brute_force(c, remaining, m))
+
+    masks = (0b000_000_111, 0b100_010_001)
+    assert p.exact([c], 4, masks)[0] == pytest.approx(
+        brute_force(c, remaining, 4, masks)
+    )
+
+
+def test_exact_3():
+    c = card.Card(2, (1, 2, 3, 4), 0b0011)
+    p = probability.WinProbability([])
+    assert p.exact([c], 0) == (1.0,)
+
+    c = card.Card(2, (1, 2, 3, 4))
+    assert p.exact([c], 5) == (0.0,)
+
+
+def test_exact_4():
+    # the same need structure is computed only once
+    cards = [card.Card(3, range(i, i + 9), 0b000_010_001) for i in range(5)]
+    p = probability.WinProbability(range(30))
+    r = p.exact(cards, 6)
+    assert len(set(r)) == 1
+    assert len(p._memo) == 1
+
+    p.call(2)
+    assert 2 not in p.remaining
+    r = p.exact(cards, 6)
+    # label 2 is on a filled square on the third card and not on the last two
+    assert r[2] == r[3] == r[4] > r[0]
+
+
+def test_exact_5():
+    c = variant.VariantCard(variant.BINGO_30, range(1, 10))
+    p = probability.WinProbability(range(1, 31))
+    assert p.exact([c], 9)[0] == pytest.approx(1 / 14307150)
+    assert p.exact([c], 30)[0] == 1.0
+
+
+def test_sampled_1():
+    c = card.Card(3, range(1, 10))
+    c.fill_by_label(5)
+    p = probability.WinProbability(range(1, 16))
+    exact = p.exact([c, c], 7)
+    sampled = p.sampled([c, c], 7, trials=20000, rng=random.Random(1))
+    assert sampled[0] == sampled[1]
+    assert sampled[0] == pytest.approx(exact[0], abs=0.02)
+
+    c = card.Card(2, (1, 2, 3, 4), 0b0011)
+    assert p.sampled([c], 0, trials=10) == (1.0,)
+
+
+SAMPLED_STR = """
+import random
+import binguistics.card as card
+import binguistics.probability as probability
+
+labels = [f"L{i}" for i in range(16)]
+c = card.Card(3, labels[:9])
+p = probability.WinProbability(labels)
+print(p.sampled([c], 6, trials=200, rng=random.Random(1)))
+"""
+
+
+def test_sampled_2():
+    # str labels give the same results whatever the hash seed is
+    r = {
+        subprocess.run(
+            [sys.executable, "-c", SAMPLED_STR],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        for seed in ("0", "1", "2")
+    }
+    assert len(r) == 1
+
+
+def test_exact_6():
+    # only the most recently used coefficients are kept
+    cards = [card.Card(3, range(1, 10)) for _ in range(4)]
+    for i, c in enumerate(cards):
+        c.fill_by_label(i + 1)
+    p = probability.WinProbability(range(1, 16))
+    expected = probability.WinProbability(range(1, 16)).exact(cards, 6)
+    p.maxsize = 2
+    assert p.exact(cards, 6) == expected
+    assert len(p._memo) == 2
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_exact_101():
+    probability.WinProbability(range(10)).exact([], -1)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_sampled_101():
+    probability.WinProbability(range(10)).sampled([], 3, trials=0)
@@ -0,0 +1,93 @@
+import binguistics.card as card
+import binguistics.render as render
+import binguistics.variant as variant
+
+
+def test_render_1():
+    c = card.CardBase(3)
+    assert render.render(c, blank="0", filled="1", free="F") == "000\n000\n000\n"
+
+    c = card.CardBase(3, 0b000_010_011, (2,))
+    assert render.render(c, blank="0", filled="1", free="F") == "100\n110\nF00\n"
+
+    v = variant.Variant("2x3", 2, 3, ("row",))
+    c = variant.VariantCardBase(v, 0b10_00_01, (2,))
+    assert render.render(c, blank="0", filled="1", free="F") == "1F0\n001\n"
+
+
+def test_render_2():
+    c = card.CardBase(4, 0b1110_0101_1100_0000, (5, 2, 4))
+    assert render.render(c, blank=".", filled="{}", free="F").splitlines() == [
+        ".F{}.",
+        ".F.{}",
+        "F{}{}{}",
+        ".{}.{}",
+    ]
+
+
+def test_card_view_1():
+    c = card.CardBase(3, free=(4,))
+    v = render.CardView(c, blank="0", filled="1", free="F")
+    assert v.card is c
+    assert v.text == "000\n0F0\n000\n"
+    assert v.update() == ()
+
+    c.fill(1)
+    c.fill(6)
+    c.fill(4)
+    assert v.text == "000\n0F0\n000\n"
+    assert v.update() == (1, 6)
+    assert v.text == "001\n1F0\n000\n"
+    assert v.text == render.render(c, blank="0", filled="1", free="F")
+    assert v.update() == ()
+
+
+def test_export_text_1():
+    c1 = card.Card(2, (1, 2, 30, 4))
+    c1.fill_by_label(30)
+    c2 = card.Card(2, ("a", "b", "c"), free=(3,))
+    assert render.export_text([c1, c2]) == (
+        " 1  30*\n 2   4\n\n   a     c\n   b  FREE\n"
+    )
+    assert render.export_text([card.CardBase(2, 0b0001)], mark="+") == "+\n\n"
+
+
+def test_export_html_1():
+    c = card.Card(2, ("<a>", "b", "c"), free=(3,))
+    c.fill_by_label("b")
+    assert render.export_html([c], free="&") == (
+        '<table class="card">\n'
+        '<tr><td class="blank">&lt;a&gt;</td><td class="blank">c</td></tr>\n'
+        '<tr><td class="filled">b</td><td class="free">&amp;</td></tr>\n'
+        "</table>\n"
+    )
+
+
+def test_export_svg_1():
+    c = card.Card(2, ("a", "b", "c"), free=(3,))
+    c.fill_by_label("b")
+    svg = render.export_svg([c, c], cell=10)
+    assert svg.startswith('<svg xmlns="http://www.w3.org/2000/svg"')
+    assert 'width="20" height="50"' in svg
+    assert svg.count("<rect") == 8
+    assert svg.count('<rect class="filled" x="0" y="10"') == 2
+    assert svg.count('<rect class="free" x="10" y="10"') == 2
+    assert '<g transform="translate(0,30)">' in svg
+    assert svg.endswith("</svg>\n")
+
+
+def test_show_1():
+    # Showing a card does not import the variant module or what only
+    # the exports need.
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, binguistics.card as card;"
+        "card.Card(3, range(8), free=(4,)).show();"
+        "print(sorted({'binguistics.variant', 'enum', 'html'} & set(sys.modules)))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert out.splitlines()[-1] == "[]"
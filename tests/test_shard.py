@@ -0,0 +1,146 @@
+import os
+import random
+
+import binguistics.card as card
+import binguistics.shard as shard
+import binguistics.variant as variant
+import pytest
+
+
+def make_cards(n, size=5, seed=0):
+    rng = random.Random(seed)
+    free = (size**2 // 2,)
+    return [
+        card.Card(size, rng.sample(range(1, 76), size**2 - 1), free=free)
+        for _ in range(n)
+    ]
+
+
+def test_sharded_hall_1():
+    cards = make_cards(40)
+    calls = random.Random(1).sample(range(1, 76), 75)
+
+    with shard.ShardedHall(cards, processes=3, k=2) as hall:
+        assert len(hall) == 40
+        assert hall.size == 5
+        assert hall.processes == 3
+        assert hall.states() == tuple(c.state for c in cards)
+
+        won = set()
+        for label in calls[:30]:
+            winners = hall.draw(label)
+            expected = []
+            for i, c in enumerate(cards):
+                c.fill_by_label(label)
+                if i not in won and c.is_bingo(2):
+                    won.add(i)
+                    expected.append(i)
+            assert winners == tuple(expected)
+
+        r = hall.draw_many(calls[30:])
+        for label, winners in zip(calls[30:], r):
+            expected = []
+            for i, c in enumerate(cards):
+                c.fill_by_label(label)
+                if i not in won and c.is_bingo(2):
+                    won.add(i)
+                    expected.append(i)
+            assert winners == tuple(expected)
+
+        assert hall.states() == tuple(c.state for c in cards)
+        assert hall.state(7) == cards[7].state
+        assert len(won) == 40
+
+
+def test_sharded_hall_2():
+    # cards that have already won are not reported again
+    cards = [card.Card(2, (1, 2, 3, 4), 0b0011), card.Card(2, (1, 2, 3, 4))]
+    hall = shard.ShardedHall(cards, processes=8)
+    assert hall.processes == 2
+    assert hall.draw(1) == ()
+    assert hall.draw(2) == (1,)
+    assert hall.draw_many([3, 4, 5]) == ((), (), ())
+    hall.close()
+    hall.close()
+
+
+class ChildUnhashable:
+    # A label that cannot be hashed in worker processes.
+    def __init__(self):
+        self.pid = os.getpid()
+
+    def __hash__(self):
+        if os.getpid() != self.pid:
+            raise TypeError("unhashable in a worker")
+        return 0
+
+
+def test_sharded_hall_4():
+    # a bad label neither draws anything nor breaks the hall
+    cards = [card.Card(2, (1, 2, 3, 4)), card.Card(2, (4, 3, 2, 1))]
+    with shard.ShardedHall(cards, processes=2) as hall:
+        with pytest.raises(TypeError):
+            hall.draw_many([1, [5]])
+        assert hall.states() == (0, 0)
+        with pytest.raises(TypeError):
+            hall.draw_many([1, ChildUnhashable(), 2])
+        assert hall.states() == (0b0001, 0b1000)
+        assert hall.draw(3) == (0, 1)
+        assert hall.states() == (0b0101, 0b1010)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_sharded_hall_101():
+    shard.ShardedHall([])
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_sharded_hall_102():
+    shard.ShardedHall(make_cards(1, 3) + make_cards(1, 4))
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_sharded_hall_103():
+    shard.ShardedHall(make_cards(1), processes=0)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_sharded_hall_104():
+    hall = shard.ShardedHall(make_cards(2), processes=1)
+    hall.close()
+    hall.draw(1)
+
+
+def test_sharded_hall_3():
+    # 90-ball tickets; the hall reports full houses
+    rng = random.Random(2)
+    cards = []
+    for _ in range(12):
+        free = [sq for row in range(3) for sq in rng.sample(range(row, 27, 3), 4)]
+        cards.append(
+            variant.VariantCard(
+                variant.BINGO_90, rng.sample(range(1, 91), 15), free=free
+            )
+        )
+    calls = rng.sample(range(1, 91), 90)
+
+    with shard.ShardedHall(cards, processes=2, k=3) as hall:
+        assert (hall.height, hall.width) == (3, 9)
+        r = hall.draw_many(calls)
+        won = set()
+        for label, winners in zip(calls, r):
+            expected = []
+            for i, c in enumerate(cards):
+                c.fill_by_label(label)
+                if i not in won and c.is_bingo(3):
+                    won.add(i)
+                    expected.append(i)
+            assert winners == tuple(expected)
+        assert len(won) == 12
+        assert hall.states() == tuple(c.state for c in cards)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_sharded_hall_105():
+    c = variant.VariantCard(variant.Variant("rows5", 5, 5, ("row",)), range(25))
+    shard.ShardedHall(make_cards(1) + [c])
@@ -0,0 +1,141 @@
+import concurrent.futures
+import io
+import random
+
+import binguistics.card as card
+import binguistics.stream as stream
+import binguistics.variant as variant
+import pytest
+
+
+def random_states(n, size=3, seed=0):
+    rng = random.Random(seed)
+    return [rng.getrandbits(size**2) for _ in range(n)]
+
+
+def test_chunks_1():
+    assert list(stream.chunks(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(stream.chunks([], 3)) == []
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_chunks_101():
+    list(stream.chunks(range(7), 0))
+
+
+def test_evaluate_1():
+    states = (0b011_000_000, 0b111_000_000, 0b010_001_100, 0b111_000_111)
+    r = stream.evaluate(3, states, start=10)
+    assert r == [
+        stream.Record(10, 0b011_000_000, False, True, (8,)),
+        stream.Record(11, 0b111_000_000, True, False, ()),
+        stream.Record(13, 0b111_000_111, True, True, (3, 4, 5)),
+    ]
+    assert len(stream.evaluate(3, states, everything=True)) == 4
+    assert [x.bingo for x in stream.evaluate(3, states, k=2)] == [False, True]
+
+
+def test_stream_1():
+    states = random_states(1000)
+    expected = []
+    for i, s in enumerate(states):
+        c = card.CardBase(3, s)
+        bingo = c.is_bingo()
+        ready = c.is_ready()
+        if bingo or ready:
+            expected.append((i, s, bingo, ready, c.last_pieces_for_bingo()))
+
+    assert list(stream.stream(states, 3, chunk_size=64)) == expected
+    assert list(stream.stream(iter(states), 3, chunk_size=1000000)) == expected
+
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        r = stream.stream(states, 3, chunk_size=37, executor=executor, prefetch=2)
+        assert list(r) == expected
+
+
+def test_stream_2():
+    # only a bounded number of states are taken ahead
+    taken = []
+
+    def source():
+        for s in random_states(100):
+            taken.append(s)
+            yield s
+
+    it = stream.stream(source(), 3, chunk_size=10, everything=True)
+    next(it)
+    assert len(taken) == 10
+
+
+def test_stream_3():
+    # Chunks evaluated by several threads share the line analysis cache,
+    # which evicts most of the analyses of 25-bit states.
+    states = [card.CardBase(5, s).state for s in random_states(20000, 5)]
+    expected = stream.evaluate(5, states, everything=True)
+
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        r = stream.stream(
+            states, 5, chunk_size=500, everything=True, executor=executor, prefetch=16
+        )
+        assert list(r) == expected
+
+        cards = (card.CardBase(5, s) for s in states)
+        r = stream.stream_cards(
+            cards, chunk_size=500, everything=True, executor=executor
+        )
+        assert list(r) == expected
+
+
+def test_evaluate_cards_1():
+    # Cards of different sizes and game types
+    cards = [
+        card.CardBase(3, 0b111_000_000),
+        variant.VariantCardBase(variant.BINGO_90, (1 << 26) - 1),
+        card.Card(2, "abcd", 0b0010),
+        variant.VariantCard(variant.BINGO_30, range(9), 0b111_111_110),
+    ]
+    assert stream.evaluate_cards(cards, start=5) == [
+        stream.Record(5, 0b111_000_000, True, False, ()),
+        stream.Record(6, (1 << 26) - 1, True, True, (26,)),
+        stream.Record(7, 0b0010, False, True, (0, 2, 3)),
+        stream.Record(8, 0b111_111_110, False, True, (0,)),
+    ]
+    assert list(stream.stream_cards(cards, chunk_size=3, k=2)) == [
+        stream.Record(1, (1 << 26) - 1, True, True, (26,)),
+        stream.Record(2, 0b0010, False, True, (0, 2, 3)),
+        stream.Record(3, 0b111_111_110, False, True, (0,)),
+    ]
+
+
+def test_read_states_1():
+    states = [card.CardBase(5, s).state for s in random_states(100, 5)]
+    f = io.BytesIO()
+    assert stream.write_states(f, states, 5) == 100
+    assert len(f.getvalue()) == 100 * 4
+    f.seek(0)
+    assert list(stream.read_states(f, 5, chunk_size=7)) == states
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_read_states_101():
+    list(stream.read_states(io.BytesIO(b"\x00" * 5), 5))
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_read_states_102():
+    stream.read_states(io.BytesIO(b"\x00" * 8), 5, chunk_size=0)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_stream_101():
+    stream.stream([0, 1], 3, prefetch=0)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_stream_102():
+    stream.stream([0, 1], 3, chunk_size=0)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_stream_cards_101():
+    stream.stream_cards([card.CardBase(3)], prefetch=0)
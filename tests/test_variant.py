@@ -0,0 +1,193 @@
+import binguistics.card as card
+import binguistics.variant as variant
+import pytest
+
+
+def test_win_mask_1():
+    mask75 = variant.win_mask(variant.BINGO_75)
+    assert [int(m) for m in mask75] == [int(m) for m in card.line_mask(5)]
+    assert [m.name for m in mask75] == [m.name for m in card.line_mask(5)]
+    assert variant.win_mask(variant.BINGO_75) is mask75
+
+
+def test_win_mask_2():
+    mask90 = variant.win_mask(variant.BINGO_90)
+    assert len(mask90) == 3
+    assert mask90.ROW_0 == sum(1 << i for i in range(0, 27, 3))
+    assert mask90.ROW_1 == mask90.ROW_0 << 1
+    assert mask90.ROW_2 == mask90.ROW_0 << 2
+
+    mask30 = variant.win_mask(variant.BINGO_30)
+    assert len(mask30) == 1
+    assert mask30.FULL == 0b111_111_111
+
+
+def test_win_mask_3():
+    v = variant.Variant("2x3", 2, 3, ("row", "column", "full"))
+    assert v.lines == ("column", "row", "full")
+    mask = variant.win_mask(v)
+    assert mask.COLUMN_0 == 0b00_00_11
+    assert mask.COLUMN_2 == 0b11_00_00
+    assert mask.ROW_0 == 0b01_01_01
+    assert mask.ROW_1 == 0b10_10_10
+    assert mask.FULL == 0b11_11_11
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_variant_101():
+    variant.Variant("bad", 1, 9)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_variant_102():
+    variant.Variant("bad", 3, 9, ("diagonal",))
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_variant_103():
+    variant.Variant("bad", 3, 3, ("corner",))
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_variant_104():
+    variant.Variant("bad", 3, 3, ())
+
+
+def test_init_1():
+    # 5 numbers and 4 blanks per row
+    blanks = (0, 4, 8, 10, 11, 12, 15, 19, 23, 25, 26, 2)
+    c = variant.VariantCardBase(variant.BINGO_90, free=blanks)
+    assert c.height == 3
+    assert c.width == 9
+    assert c.free == tuple(sorted(blanks))
+    assert c.filled == ()
+    assert len(c.blank) == 15
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_init_101():
+    variant.VariantCardBase(variant.BINGO_90, state=1 << 27)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_init_102():
+    variant.VariantCardBase(variant.BINGO_30, free=(9,))
+
+
+def test_is_bingo_1():
+    mask90 = variant.win_mask(variant.BINGO_90)
+    c = variant.VariantCardBase(variant.BINGO_90, free=(0, 3, 6, 9))
+    assert not c.is_bingo()
+    assert c.analyze_missing(5) == (mask90.ROW_0,)
+
+    for sq in range(12, 27, 3):
+        c.fill(sq)
+    assert c.is_bingo(1)
+    assert not c.is_bingo(2)
+    assert c.analyze_missing(0) == (mask90.ROW_0,)
+
+    for sq in range(1, 27, 3):
+        c.fill(sq)
+    for sq in range(2, 27, 3):
+        c.fill(sq)
+    assert c.is_bingo(3)
+
+
+def test_is_ready_1():
+    c = variant.VariantCardBase(variant.BINGO_30, state=0b111_011_111)
+    assert c.is_ready()
+    assert not c.is_bingo()
+    assert c.last_pieces_for_bingo() == (5,)
+
+    c = variant.VariantCardBase(variant.BINGO_30, state=0b111_011_011)
+    assert not c.is_ready()
+    assert c.last_pieces_for_bingo() == ()
+
+
+def test_is_ready_2():
+    for s in (0b01110_11101_10111_10111_11011, 0b011_000_000, 0b111_000_111):
+        size = 5 if s.bit_length() > 9 else 3
+        v = variant.Variant(f"sq{size}", size, size)
+        f = (2,)
+        a = card.CardBase(size, s, f)
+        b = variant.VariantCardBase(v, s, f)
+        assert a.is_ready() == b.is_ready()
+        assert a.last_pieces_for_bingo() == b.last_pieces_for_bingo()
+        assert [a.is_bingo(k) for k in range(4)] == [b.is_bingo(k) for k in range(4)]
+
+
+def test_show_1(capsys):
+    v = variant.Variant("2x3", 2, 3, ("row",))
+    c = variant.VariantCardBase(v, 0b10_00_01, (2,))
+    c.show(blank="0", filled="1", free="F")
+    out, _ = capsys.readouterr()
+    assert out == "1F0\n001\n"
+
+
+def test_card_1():
+    c = variant.VariantCard(variant.BINGO_30, range(1, 9), free=(4,))
+    assert [c.label(i) for i in range(9)] == [1, 2, 3, 4, None, 5, 6, 7, 8]
+    for label in range(1, 9):
+        assert not c.is_bingo()
+        c.fill_by_label(label)
+    assert c.is_bingo()
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_card_101():
+    variant.VariantCard(variant.BINGO_30, range(9), free=(4,))
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_card_102():
+    c = variant.VariantCard(variant.BINGO_30, range(9))
+    c.label(9)
+
+
+def test_card_2():
+    # Square and variant cards share the line analysis and free layouts.
+    free = (0, 3, 6, 9)
+    a = variant.VariantCard(variant.BINGO_90, range(23), free=free)
+    b = variant.VariantCard(variant.BINGO_90, range(23), free=free)
+    assert a == b and hash(a) == hash(b)
+    assert a.layout is b.layout
+    assert a.line_masks == tuple(variant.win_mask(variant.BINGO_90))
+    b.fill_by_label(5)
+    assert a != b
+
+    c = variant.VariantCardBase(variant.BINGO_90, b.state, b.layout)
+    assert c.filled == b.filled
+    assert c != b
+
+    v = variant.Variant("sq5", 5, 5)
+    assert variant.VariantCardBase(v).line_masks == card.line_mask_values(5)
+
+
+def test_card_3():
+    vocabulary = card.LabelVocabulary()
+    c = variant.VariantCard(
+        variant.BINGO_30, "abcdefgh", free=(4,), vocabulary=vocabulary
+    )
+    assert c.vocabulary is vocabulary
+    assert c == variant.VariantCard(variant.BINGO_30, "abcdefgh", free=(4,))
+    for label in "abcdefgh":
+        assert not c.is_bingo()
+        c.fill_by_id(vocabulary.lookup(label))
+    assert c.is_bingo()
+    assert c.label(4) is None
+    assert c.label(5) == "e"
+
+
+def test_pickle_1():
+    import pickle
+
+    c = variant.VariantCard(variant.BINGO_90, range(27), state=0b111)
+    d = pickle.loads(pickle.dumps(c))
+    assert d == c
+    assert d._lines is c._lines
+    assert d.analyze_missing(6) == c.analyze_missing(6)
+
+
+@pytest.mark.xfail(raises=ValueError)
+def test_init_103():
+    variant.VariantCardBase(variant.BINGO_90, free=card.free_layout(5, (0,)))